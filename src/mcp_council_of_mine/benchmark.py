@@ -0,0 +1,248 @@
+"""
+End-to-end debate benchmark against the fake sampling backend.
+
+Runs full start → vote → results cycles through the tool functions and
+reports wall-clock percentiles, sampling call counts, prompt volume and
+CPU time per phase as JSON that can be diffed between versions:
+
+    python -m mcp_council_of_mine.benchmark --runs 20 --output bench.json
+"""
+
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+from collections import OrderedDict
+from importlib import metadata
+from mcp_council_of_mine import resilience
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.fake_sampling import (
+    LATENCY_DISTRIBUTIONS,
+    FakeContext,
+    FakeSamplingBackend,
+    LatencyModel,
+)
+from mcp_council_of_mine.tools.debate import start_council_debate
+from mcp_council_of_mine.tools.voting import conduct_voting
+from mcp_council_of_mine.tools.results import get_results
+
+PHASES = ("opinions", "voting", "results")
+
+TOPICS = [
+    "Should we adopt a four-day work week?",
+    "Is a monorepo the right choice for a team of fifty engineers?",
+    "Should we rewrite the billing service in a new language?",
+    "Should product teams own their on-call rotations?",
+    "Is it time to move our infrastructure to a single cloud provider?",
+]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(values: list[float]) -> dict:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": round(max(values), 3)
+    }
+
+
+async def _timed_phase(backend: FakeSamplingBackend, call) -> dict:
+    """Run one tool call, measuring wall and CPU time and the sampling it caused"""
+    calls_before = sum(backend.calls.values())
+    chars_before = sum(backend.prompt_chars.values())
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+
+    await call()
+
+    return {
+        "wall_ms": (time.perf_counter() - wall_started) * 1000,
+        "cpu_ms": (time.process_time() - cpu_started) * 1000,
+        "sampling_calls": sum(backend.calls.values()) - calls_before,
+        "prompt_chars": sum(backend.prompt_chars.values()) - chars_before
+    }
+
+
+async def run_debate_cycle(
+    backend: FakeSamplingBackend,
+    topic: str,
+    batched: bool = False,
+    use_cache: bool = False
+) -> dict[str, dict]:
+    """One start → vote → results cycle; returns measurements keyed by phase"""
+    ctx = FakeContext(backend)
+
+    return {
+        "opinions": await _timed_phase(
+            backend, lambda: start_council_debate.fn(topic, ctx, batched=batched, use_cache=use_cache)
+        ),
+        "voting": await _timed_phase(
+            backend, lambda: conduct_voting.fn(ctx, batched=batched, use_cache=use_cache)
+        ),
+        "results": await _timed_phase(
+            backend, lambda: get_results.fn(ctx, use_cache=use_cache)
+        )
+    }
+
+
+def run_benchmark(
+    runs: int = 20,
+    seed: str = "benchmark",
+    latency: LatencyModel | None = None,
+    failure_rate: float = 0.0,
+    malformed_rate: float = 0.0,
+    batched: bool = False,
+    use_cache: bool = False
+) -> dict:
+    """
+    Run `runs` debate cycles, each in a fresh debates directory and with a
+    fresh circuit breaker, and return the JSON-serializable report.
+    """
+    latency = latency or LatencyModel(median=0.05, spread=0.5)
+    measurements = []
+    saved_state_manager = state_module._state_manager
+    saved_breakers = resilience._circuit_breakers
+
+    try:
+        with tempfile.TemporaryDirectory() as debates_dir:
+            for run in range(runs):
+                state_module._state_manager = StateManager(debates_dir=debates_dir)
+                resilience._circuit_breakers = OrderedDict()
+                backend = FakeSamplingBackend(
+                    seed=f"{seed}:{run}",
+                    latency=latency,
+                    failure_rate=failure_rate,
+                    malformed_rate=malformed_rate
+                )
+                measurements.append(asyncio.run(
+                    run_debate_cycle(backend, TOPICS[run % len(TOPICS)], batched, use_cache)
+                ))
+                state_module._state_manager.close()
+    finally:
+        state_module._state_manager = saved_state_manager
+        resilience._circuit_breakers = saved_breakers
+
+    phases = {}
+    for phase in (*PHASES, "total"):
+        if phase == "total":
+            rows = [
+                {key: sum(run[p][key] for p in PHASES) for key in run["opinions"]}
+                for run in measurements
+            ]
+        else:
+            rows = [run[phase] for run in measurements]
+
+        phases[phase] = {
+            "wall_ms": summarize([row["wall_ms"] for row in rows]),
+            "cpu_ms": summarize([row["cpu_ms"] for row in rows]),
+            "sampling_calls_per_run": round(sum(row["sampling_calls"] for row in rows) / max(runs, 1), 2),
+            "prompt_chars_per_run": round(sum(row["prompt_chars"] for row in rows) / max(runs, 1))
+        }
+
+    try:
+        version = metadata.version("mcp-council-of-mine")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+
+    return {
+        "version": version,
+        "python": platform.python_version(),
+        "config": {
+            "runs": runs,
+            "seed": seed,
+            "batched": batched,
+            "use_cache": use_cache,
+            "failure_rate": failure_rate,
+            "malformed_rate": malformed_rate,
+            "latency": {
+                "distribution": latency.distribution,
+                "median": latency.median,
+                "spread": latency.spread,
+                "per_token": latency.per_token,
+                "jitter": latency.jitter,
+                "time_scale": latency.time_scale
+            }
+        },
+        "phases": phases
+    }
+
+
+def format_report(report: dict) -> str:
+    """Human-readable table of a benchmark report"""
+    lines = [
+        f"Council of Mine benchmark: {report['config']['runs']} runs "
+        f"(version {report['version']}, Python {report['python']})",
+        f"{'phase':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'cpu p50':>9} {'calls':>7} {'prompt chars':>13}"
+    ]
+    for phase, stats in report["phases"].items():
+        lines.append(
+            f"{phase:<10} {stats['wall_ms']['p50']:>9.1f} {stats['wall_ms']['p95']:>9.1f} "
+            f"{stats['wall_ms']['p99']:>9.1f} {stats['cpu_ms']['p50']:>9.1f} "
+            f"{stats['sampling_calls_per_run']:>7} {stats['prompt_chars_per_run']:>13}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark full council debates against simulated sampling")
+    parser.add_argument("--runs", type=int, default=20, help="Debate cycles to run (default: 20)")
+    parser.add_argument("--seed", default="benchmark", help="Seed for responses, latency and failures")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency", type=float, default=0.05, help="Median sampling latency in seconds")
+    parser.add_argument("--spread", type=float, default=0.5, help="Width of the latency distribution")
+    parser.add_argument("--per-token", type=float, default=0.0, help="Extra seconds per max_tokens")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- fraction applied to each latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--batched", action="store_true", help="Use batched opinions and ballots")
+    parser.add_argument("--use-cache", action="store_true", help="Allow the sampling cache between runs")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+
+    report = run_benchmark(
+        runs=args.runs,
+        seed=args.seed,
+        latency=LatencyModel(
+            distribution=args.distribution,
+            median=args.latency,
+            spread=args.spread,
+            per_token=args.per_token,
+            jitter=args.jitter
+        ),
+        failure_rate=args.failure_rate,
+        malformed_rate=args.malformed_rate,
+        batched=args.batched,
+        use_cache=args.use_cache
+    )
+
+    print(format_report(report), file=sys.stderr)
+
+    report_json = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report_json + "\n")
+    else:
+        print(report_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from mcp_council_of_mine.config import env_int, env_flag
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_DISK_CACHE_ENTRIES = 10000
+DISK_PRUNE_INTERVAL = 50
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so cosmetic prompt differences share a cache entry"""
+    return " ".join(prompt.split())
+
+
+class SamplingCache:
+    """
+    Two-tier cache for sampling responses.
+    An in-memory LRU tier sits in front of an optional on-disk tier; both
+    evict entries older than ttl_seconds and cap how many entries they hold.
+    Async callers use aget/aset, which run disk reads, writes and pruning
+    in a worker thread so they never block the event loop. The memory tier
+    is only touched from the caller's thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS,
+        disk_dir: str | Path | None = None,
+        max_disk_entries: int = DEFAULT_DISK_CACHE_ENTRIES
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # The first disk write prunes entries left over from earlier runs
+        self._writes_since_prune = DISK_PRUNE_INTERVAL
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        member_id: int | None,
+        prompt: str,
+        temperature: float | None,
+        max_tokens: int | None,
+        system_prompt: str | None = None
+    ) -> str:
+        prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+        system_hash = (
+            hashlib.sha256(normalize_prompt(system_prompt).encode("utf-8")).hexdigest()
+            if system_prompt else ""
+        )
+        raw = json.dumps([member_id, prompt_hash, system_hash, temperature, max_tokens])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created: float) -> bool:
+        return time.time() - created > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _count_evictions(self, count: int = 1):
+        with self._lock:
+            self.evictions += count
+
+    def get(self, key: str) -> str | None:
+        """Look up a response, reading the disk tier inline"""
+        value = self._get_from_memory(key)
+        if value is not None:
+            return value
+
+        entry = self._get_from_disk(key) if self.disk_dir else None
+        return self._finish_disk_lookup(key, entry)
+
+    async def aget(self, key: str) -> str | None:
+        """Look up a response, reading the disk tier in a worker thread"""
+        value = self._get_from_memory(key)
+        if value is not None:
+            return value
+
+        entry = await asyncio.to_thread(self._get_from_disk, key) if self.disk_dir else None
+        return self._finish_disk_lookup(key, entry)
+
+    def _get_from_memory(self, key: str) -> str | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+
+        created, value = entry
+        if self._is_expired(created):
+            del self._memory[key]
+            self._count_evictions()
+            return None
+
+        self._memory.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _finish_disk_lookup(self, key: str, entry: tuple[float, str] | None) -> str | None:
+        if entry is None:
+            self.misses += 1
+            return None
+
+        created, value = entry
+        self._set_memory(key, value, created)
+        self.hits += 1
+        self.disk_hits += 1
+        return value
+
+    def _get_from_disk(self, key: str) -> tuple[float, str] | None:
+        """(created, value) of a live disk entry; safe to call from a worker thread"""
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            created, value = entry["created"], entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            logging.warning(f"Discarding unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if self._is_expired(created):
+            path.unlink(missing_ok=True)
+            self._count_evictions()
+            return None
+
+        return created, value
+
+    def _set_memory(self, key: str, value: str, created: float):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._count_evictions()
+
+    def set(self, key: str, value: str):
+        """Store a response, writing the disk tier inline"""
+        created = time.time()
+        self._set_memory(key, value, created)
+
+        if self.disk_dir:
+            self._write_to_disk(key, value, created)
+
+    async def aset(self, key: str, value: str):
+        """Store a response, writing the disk tier in a worker thread"""
+        created = time.time()
+        self._set_memory(key, value, created)
+
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_to_disk, key, value, created)
+
+    def _write_to_disk(self, key: str, value: str, created: float):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({"created": created, "value": value}, f)
+        except OSError as e:
+            logging.warning(f"Failed to write cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= DISK_PRUNE_INTERVAL
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """Remove expired disk entries, then the oldest ones beyond max_disk_entries"""
+        if not self.disk_dir or not self._prune_lock.acquire(blocking=False):
+            # Another thread is already pruning
+            return
+
+        try:
+            with self._lock:
+                self._writes_since_prune = 0
+
+            entries = []
+            for path in self.disk_dir.glob("*/*.json"):
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+
+                if self._is_expired(mtime):
+                    path.unlink(missing_ok=True)
+                    self._count_evictions()
+                else:
+                    entries.append((mtime, path))
+
+            excess = len(entries) - self.max_disk_entries
+            if excess > 0:
+                for _, path in sorted(entries)[:excess]:
+                    path.unlink(missing_ok=True)
+                self._count_evictions(excess)
+        finally:
+            self._prune_lock.release()
+
+    def clear(self):
+        self._memory.clear()
+        if self.disk_dir:
+            for path in self.disk_dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_enabled": self.disk_dir is not None
+        }
+
+
+_sampling_cache: SamplingCache | None = None
+
+
+def get_sampling_cache() -> SamplingCache:
+    """
+    Shared sampling cache configured from the environment:
+    COUNCIL_SAMPLING_CACHE_SIZE, COUNCIL_SAMPLING_CACHE_TTL (seconds) and
+    COUNCIL_SAMPLING_CACHE_DISK=1 to persist entries in sampling_cache/
+    next to the debates/ directory.
+    """
+    global _sampling_cache
+
+    if _sampling_cache is None:
+        from mcp_council_of_mine.council.state import get_state_manager
+
+        disk_dir = None
+        if env_flag("COUNCIL_SAMPLING_CACHE_DISK"):
+            disk_dir = get_state_manager().debates_dir.parent / "sampling_cache"
+
+        _sampling_cache = SamplingCache(
+            max_entries=env_int("COUNCIL_SAMPLING_CACHE_SIZE", DEFAULT_CACHE_SIZE),
+            ttl_seconds=env_int("COUNCIL_SAMPLING_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS),
+            disk_dir=disk_dir
+        )
+
+    return _sampling_cache
@@ -0,0 +1,92 @@
+import re
+import math
+from collections import Counter
+from mcp_council_of_mine.config import env_int
+
+DEFAULT_DIGEST_LENGTH = 400
+MIN_DIGEST_LENGTH = 80
+MIN_RELATIVE_SCORE = 0.25
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves
+""".split())
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+WORD = re.compile(r"[a-z0-9']+")
+
+
+def get_digest_length() -> int:
+    """Default digest target in characters, via COUNCIL_OPINION_DIGEST_CHARS"""
+    return max(MIN_DIGEST_LENGTH, env_int("COUNCIL_OPINION_DIGEST_CHARS", DEFAULT_DIGEST_LENGTH))
+
+
+def _content_words(text: str) -> list[str]:
+    return [word for word in WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 2]
+
+
+def _truncate_at_word(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars - 1].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "…"
+
+
+def digest_opinion(text: str, target_chars: int) -> str:
+    """
+    Extractive digest of an opinion in at most target_chars characters.
+    Sentences are scored by how many of the opinion's recurring content words
+    they carry (with a bonus for the opening sentence) and the best ones are
+    kept in their original order; low-scoring filler is dropped even if it
+    would fit. Purely local and deterministic.
+    """
+    text = text.strip()
+    if len(text) <= target_chars:
+        return text
+
+    sentences = [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+    if len(sentences) <= 1:
+        return _truncate_at_word(text, target_chars)
+
+    frequencies = Counter(_content_words(text))
+
+    scored = []
+    for index, sentence in enumerate(sentences):
+        words = _content_words(sentence)
+        score = sum(frequencies[word] for word in set(words)) / math.sqrt(len(words) + 1)
+        if index == 0:
+            score *= 1.5
+        scored.append((-score, index, sentence))
+
+    # Sentences far below the best one are filler and not worth the space
+    threshold = -min(scored)[0] * MIN_RELATIVE_SCORE
+
+    selected = []
+    used = 0
+    for negative_score, index, sentence in sorted(scored):
+        if -negative_score < threshold:
+            break
+
+        cost = len(sentence) + (1 if selected else 0)
+        if used + cost <= target_chars:
+            selected.append((index, sentence))
+            used += cost
+
+    if not selected:
+        return _truncate_at_word(sentences[0], target_chars)
+
+    return " ".join(sentence for _, sentence in sorted(selected))
+
+
+def digest_opinions(opinions: dict, target_chars: int) -> dict:
+    """Copy of an opinions mapping with each opinion text replaced by its digest"""
+    return {
+        member_id: {**opinion, "opinion": digest_opinion(opinion["opinion"], target_chars)}
+        for member_id, opinion in opinions.items()
+    }
@@ -0,0 +1,37 @@
+import os
+import logging
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back on bad values"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    try:
+        return int(value)
+    except ValueError:
+        logging.warning(f"Invalid {name} value: {value}")
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back on bad values"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning(f"Invalid {name} value: {value}")
+        return default
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment (1/true/yes/on)"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,346 @@
+import os
+import json
+import base64
+import heapq
+import bisect
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TypedDict
+from mcp_council_of_mine.security import validate_debate_id
+from mcp_council_of_mine.metrics import get_metrics
+from mcp_council_of_mine.council.storage import (
+    DEBATE_SUFFIXES,
+    MONTH_GLOB,
+    YEAR_GLOB,
+    decode_debate,
+    shard_dir,
+    shard_dirs,
+    split_debate_filename,
+)
+
+INDEX_FILE = "index.jsonl"
+
+# Rewrite the index once superseded lines outnumber live entries by this factor
+COMPACT_RATIO = 2
+
+
+class DebateSummary(TypedDict):
+    debate_id: str
+    prompt: str
+    timestamp: str
+    has_results: bool
+
+
+class _IndexEntry(DebateSummary):
+    mtime_ns: int
+
+
+def encode_cursor(debate_id: str) -> str:
+    """Opaque pagination cursor pointing just past debate_id"""
+    return base64.urlsafe_b64encode(debate_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        debate_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not validate_debate_id(debate_id):
+        raise ValueError("Invalid cursor")
+
+    return debate_id
+
+
+def write_jsonl_atomic(path: Path, records) -> bool:
+    """Replace path with one JSON record per line via a temp file and rename"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Failed to write {path}: {e}")
+        Path(tmp_path).unlink(missing_ok=True)
+        return False
+
+    return True
+
+
+def append_jsonl(path: Path, record: dict) -> bool:
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logging.warning(f"Failed to update {path}: {e}")
+        return False
+
+    return True
+
+
+def date_bound(value: str, end: bool = False) -> str:
+    """
+    Turn an ISO date or datetime into a debate_id bound (ids sort by time).
+    Start bounds are inclusive; end bounds are exclusive, so a bare end date
+    includes that whole day.
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date: {value!r}. Expected YYYY-MM-DD or an ISO datetime")
+
+    if end:
+        moment += timedelta(days=1) if len(value) == 10 else timedelta(seconds=1)
+
+    return moment.strftime("%Y%m%d_%H%M%S")
+
+
+class DebateIndex:
+    """
+    Listing metadata for every saved debate, kept in an append-only JSONL
+    file inside the debates directory. Saving a debate appends one line, so
+    listing never has to open debate bodies. The first listing after startup
+    checks every debate file's mtime (flat and sharded) against the index and
+    re-reads only files that are new or changed; later listings repeat that
+    check only when one of the directories has changed since, other than by
+    this process saving a debate.
+    """
+
+    def __init__(self, debates_dir: Path):
+        self.debates_dir = debates_dir
+        self.path = debates_dir / INDEX_FILE
+        self.entries: dict[str, _IndexEntry] | None = None
+        self.ordered_ids: list[str] = []
+        self.log_lines = 0
+        self.dir_mtimes: dict[str, int] | None = None
+        self._lock = threading.RLock()
+
+    def summaries(
+        self,
+        limit: int | None = None,
+        before_id: str | None = None,
+        since_id: str | None = None,
+        until_id: str | None = None,
+        has_results: bool | None = None,
+        pending: list[dict] = ()
+    ) -> list[DebateSummary]:
+        """
+        Saved debates, newest debate_id first. Walks the sorted ids from the
+        first one below before_id/until_id (exclusive) down to since_id
+        (inclusive) and stops after limit matches, so the cost of a page
+        depends on the page size rather than on the size of the history.
+        pending debates (saved but not yet written) are merged in and take
+        precedence over their indexed entries.
+        """
+        with self._lock:
+            self._ensure_fresh()
+
+            overlay = {debate["debate_id"]: self._entry(debate, 0) for debate in pending}
+            unindexed = sorted(
+                (
+                    debate_id for debate_id in overlay
+                    if debate_id not in self.entries
+                    and (before_id is None or debate_id < before_id)
+                    and (until_id is None or debate_id < until_id)
+                    and (since_id is None or debate_id >= since_id)
+                ),
+                reverse=True
+            )
+
+            end = len(self.ordered_ids)
+            if before_id is not None:
+                end = bisect.bisect_left(self.ordered_ids, before_id)
+            if until_id is not None:
+                end = min(end, bisect.bisect_left(self.ordered_ids, until_id))
+            start = bisect.bisect_left(self.ordered_ids, since_id) if since_id else 0
+
+            indexed = (self.ordered_ids[position] for position in range(end - 1, start - 1, -1))
+
+            page = []
+            for debate_id in heapq.merge(indexed, unindexed, reverse=True):
+                if limit is not None and len(page) >= limit:
+                    break
+
+                entry = overlay.get(debate_id) or self.entries[debate_id]
+                if has_results is not None and entry["has_results"] != has_results:
+                    continue
+
+                page.append({
+                    "debate_id": entry["debate_id"],
+                    "prompt": entry["prompt"],
+                    "timestamp": entry["timestamp"],
+                    "has_results": entry["has_results"]
+                })
+
+            return page
+
+    def count(self, pending: list[dict] = ()) -> int:
+        with self._lock:
+            self._ensure_fresh()
+            return len(self.entries) + len({debate["debate_id"] for debate in pending} - self.entries.keys())
+
+    def mtimes(self) -> dict[str, int]:
+        """debate_id -> file mtime for every saved debate, for indexes built on top of this one"""
+        with self._lock:
+            self._ensure_fresh()
+            return {debate_id: entry["mtime_ns"] for debate_id, entry in self.entries.items()}
+
+    def record(self, debate: dict, mtime_ns: int, file_path: Path | None = None):
+        """Add or replace one debate's entry after it has been written to file_path"""
+        with self._lock:
+            if self.entries is None:
+                self._load()
+
+            entry = self._entry(debate, mtime_ns)
+            if entry["debate_id"] not in self.entries:
+                bisect.insort(self.ordered_ids, entry["debate_id"])
+            self.entries[entry["debate_id"]] = entry
+            self._append(entry)
+
+            if file_path is not None and self.dir_mtimes is not None:
+                # Our own write changed these directories (the day shard up to
+                # debates/ itself); no need to rescan for it
+                relative = file_path.parent.relative_to(self.debates_dir)
+                for part in (relative, *relative.parents):
+                    directory = self.debates_dir / part
+                    self.dir_mtimes[str(directory)] = directory.stat().st_mtime_ns
+
+    def refresh(self) -> int:
+        """Reconcile the index with the debate files; returns how many files were re-read"""
+        with self._lock:
+            if self.entries is None:
+                self._load()
+
+            dir_mtimes = self._directory_mtimes()
+            files = self._debate_files()
+            reread = 0
+            changed = False
+
+            for debate_id, dir_entry in files.items():
+                mtime_ns = dir_entry.stat().st_mtime_ns
+                indexed = self.entries.get(debate_id)
+                if indexed and indexed["mtime_ns"] == mtime_ns:
+                    continue
+
+                reread += 1
+                changed = True
+                entry = self._read_entry(Path(dir_entry.path), mtime_ns)
+                if entry:
+                    self.entries[debate_id] = entry
+                else:
+                    self.entries.pop(debate_id, None)
+
+            for debate_id in set(self.entries) - set(files):
+                del self.entries[debate_id]
+                changed = True
+
+            if changed:
+                self.ordered_ids = sorted(self.entries)
+
+            if changed or self.log_lines > COMPACT_RATIO * max(len(self.entries), 1):
+                self._compact()
+
+            if reread:
+                get_metrics().inc("council_index_reread_files_total", reread)
+
+            self.dir_mtimes = dir_mtimes
+            return reread
+
+    def _debate_files(self) -> dict[str, os.DirEntry]:
+        """
+        debate_id -> file across the flat directory and the date shards,
+        preferring the current format, then the sharded copy, when a debate
+        exists more than once (e.g. mid-migration)
+        """
+        files: dict[str, tuple[tuple[int, int], os.DirEntry]] = {}
+
+        for directory in (self.debates_dir, *shard_dirs(self.debates_dir)):
+            sharded = directory != self.debates_dir
+            with os.scandir(directory) as entries:
+                for dir_entry in entries:
+                    parsed = split_debate_filename(dir_entry.name)
+                    if not parsed or not dir_entry.is_file() or not validate_debate_id(parsed[0]):
+                        continue
+
+                    debate_id, suffix = parsed
+                    if sharded and shard_dir(self.debates_dir, debate_id) != directory:
+                        # load_debate would never look here
+                        logging.warning(f"Ignoring debate file in the wrong shard: {dir_entry.path}")
+                        continue
+
+                    rank = (DEBATE_SUFFIXES.index(suffix), 0 if sharded else 1)
+                    if debate_id not in files or rank < files[debate_id][0]:
+                        files[debate_id] = (rank, dir_entry)
+
+        return {debate_id: dir_entry for debate_id, (_, dir_entry) in files.items()}
+
+    def _ensure_fresh(self):
+        if self.entries is None or self._directory_mtimes() != self.dir_mtimes:
+            self.refresh()
+
+    def _directory_mtimes(self) -> dict[str, int]:
+        """mtimes of debates/ and every year, month and day directory under it"""
+        directories = [
+            self.debates_dir,
+            *self.debates_dir.glob(YEAR_GLOB),
+            *self.debates_dir.glob(MONTH_GLOB),
+            *shard_dirs(self.debates_dir)
+        ]
+
+        mtimes = {}
+        for directory in directories:
+            try:
+                mtimes[str(directory)] = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    @staticmethod
+    def _entry(debate: dict, mtime_ns: int) -> _IndexEntry:
+        return {
+            "debate_id": debate["debate_id"],
+            "prompt": debate["prompt"],
+            "timestamp": debate["timestamp"],
+            "has_results": debate.get("results") is not None,
+            "mtime_ns": mtime_ns
+        }
+
+    def _read_entry(self, file_path: Path, mtime_ns: int) -> _IndexEntry | None:
+        try:
+            return self._entry(decode_debate(file_path.read_bytes()), mtime_ns)
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Skipping invalid debate file {file_path}: {e}")
+            return None
+
+    def _load(self):
+        self.entries = {}
+        self.log_lines = 0
+
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    self.log_lines += 1
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry["debate_id"]] = entry
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A torn final line from a crash; refresh re-reads that debate
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Failed to read debate index, rebuilding: {e}")
+
+        self.ordered_ids = sorted(self.entries)
+
+    def _append(self, entry: _IndexEntry):
+        if append_jsonl(self.path, entry):
+            self.log_lines += 1
+
+    def _compact(self):
+        if write_jsonl_atomic(self.path, (entry for _, entry in sorted(self.entries.items()))):
+            self.log_lines = len(self.entries)
@@ -0,0 +1,125 @@
+import os
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+import contextvars
+from pathlib import Path
+from typing import Callable
+from mcp_council_of_mine.metrics import get_metrics
+from mcp_council_of_mine.tracing import span
+
+
+def write_atomic(path: Path, data: bytes):
+    """
+    Write data so that path holds either the old or the new contents, never a
+    torn file: write a temp file in the same directory, fsync it, rename it
+    over path, then fsync the directory so the rename itself is durable.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on some platforms (e.g. Windows)
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class DebateWriter:
+    """
+    Write-behind queue for finished debates. submit() hands a snapshot to a
+    background thread and returns at once, so saving never blocks the event
+    loop. Until a debate is on disk it is served from pending, and flush()
+    waits for the queue to drain. close() (also registered with atexit)
+    flushes and stops the thread on shutdown. Each write runs in the
+    submitter's context, so its span joins the trace of the tool call.
+    """
+
+    def __init__(
+        self,
+        serialize: Callable[[dict], bytes],
+        on_written: Callable[[dict, Path], None] | None = None
+    ):
+        self.serialize = serialize
+        self.on_written = on_written
+        self.pending: dict[str, dict] = {}
+        self.queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: Path, debate: dict):
+        with self._lock:
+            self.pending[debate["debate_id"]] = debate
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="council-debate-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+        self.queue.put((contextvars.copy_context(), file_path, debate))
+
+    def pending_debate(self, debate_id: str) -> dict | None:
+        with self._lock:
+            return self.pending.get(debate_id)
+
+    def pending_debates(self) -> list[dict]:
+        """Snapshots submitted but not yet written"""
+        with self._lock:
+            return list(self.pending.values())
+
+    def flush(self):
+        """Block until every submitted debate has been written (or has failed)"""
+        self.queue.join()
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is None:
+            return
+
+        self.queue.put(None)
+        thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                context, file_path, debate = item
+                context.run(self._write, file_path, debate)
+            finally:
+                self.queue.task_done()
+
+    def _write(self, file_path: Path, debate: dict):
+        debate_id = debate["debate_id"]
+        try:
+            with span("state/write", debate_id=debate_id):
+                with get_metrics().timer("council_debate_save_seconds"):
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    write_atomic(file_path, self.serialize(debate))
+                if self.on_written:
+                    self.on_written(debate, file_path)
+        except Exception as e:
+            get_metrics().inc("council_debate_save_failures_total")
+            logging.error(f"Failed to save debate {debate_id}: {e}")
+        finally:
+            with self._lock:
+                if self.pending.get(debate_id) is debate:
+                    del self.pending[debate_id]
@@ -0,0 +1,291 @@
+import re
+import json
+import math
+import heapq
+import logging
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Callable, TypedDict
+from mcp_council_of_mine.compression import STOPWORDS, WORD
+from mcp_council_of_mine.council.index import DebateIndex, append_jsonl, write_jsonl_atomic
+
+SEARCH_INDEX_FILE = "search_index.jsonl"
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequency multipliers per field: a match in the topic says more than one in a ballot
+FIELD_WEIGHTS = {"prompt": 3, "synthesis": 2, "opinion": 1, "reasoning": 1}
+
+SNIPPET_CHARS = 160
+COMPACT_RATIO = 2
+
+
+class SearchHit(TypedDict):
+    debate_id: str
+    prompt: str
+    timestamp: str
+    score: float
+    matched_in: str
+    snippet: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase content words; contractions and possessives keep their stem ("council's" → "council")"""
+    words = (word.strip("'").split("'")[0] for word in WORD.findall(text.lower()))
+    return [word for word in words if len(word) > 1 and word not in STOPWORDS]
+
+
+def debate_fields(debate: dict) -> list[tuple[str, str, str]]:
+    """(field, label, text) for every searchable part of a debate"""
+    fields = [("prompt", "prompt", debate.get("prompt", ""))]
+
+    results = debate.get("results") or {}
+    if results.get("synthesis"):
+        fields.append(("synthesis", "synthesis", results["synthesis"]))
+
+    for opinion in debate.get("opinions", {}).values():
+        fields.append(("opinion", f"opinion by {opinion['member_name']}", opinion["opinion"]))
+
+    names = {str(op["member_id"]): op["member_name"] for op in debate.get("opinions", {}).values()}
+    for vote in debate.get("votes", {}).values():
+        voter = names.get(str(vote["voter_id"]), f"member {vote['voter_id']}")
+        fields.append(("reasoning", f"vote reasoning by {voter}", vote["reasoning"]))
+
+    return fields
+
+
+def weighted_terms(debate: dict) -> Counter:
+    terms = Counter()
+    for field, _, text in debate_fields(debate):
+        weight = FIELD_WEIGHTS[field]
+        for term in tokenize(text):
+            terms[term] += weight
+    return terms
+
+
+def make_snippet(debate: dict, query_terms: set[str]) -> tuple[str, str]:
+    """Best-matching field label and a short excerpt around its first match"""
+    best = None
+    for field, label, text in debate_fields(debate):
+        hits = sum(1 for term in tokenize(text) if term in query_terms)
+        if hits and (best is None or hits * FIELD_WEIGHTS[field] > best[0]):
+            best = (hits * FIELD_WEIGHTS[field], label, text)
+
+    if best is None:
+        return "prompt", debate.get("prompt", "")[:SNIPPET_CHARS]
+
+    _, label, text = best
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in sorted(query_terms)) + r")\b", re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, (match.start() if match else 0) - SNIPPET_CHARS // 3)
+    if start:
+        start = text.find(" ", start) + 1 or start
+
+    snippet = text[start:start + SNIPPET_CHARS].strip()
+    if start + SNIPPET_CHARS < len(text):
+        snippet = snippet.rsplit(" ", 1)[0] + "…"
+    if start:
+        snippet = "…" + snippet
+
+    return label, snippet
+
+
+class SearchIndex:
+    """
+    Inverted index over debate prompts, opinions, vote reasoning and
+    syntheses, ranked with BM25. Postings are compact arrays of
+    (document number, weighted term frequency); replacing a debate retires
+    its old document number instead of rewriting postings. Each saved debate
+    adds one line of term counts to search_index.jsonl, and the index is
+    reconciled against the metadata index (by file mtime) before searching,
+    so only new or changed debates are ever re-read.
+    """
+
+    def __init__(self, debates_dir: Path, metadata: DebateIndex, load_debate: Callable[[str], dict]):
+        # Inside debates/ (like index.jsonl), not beside it, so directories never share an index
+        self.path = debates_dir / SEARCH_INDEX_FILE
+        self.metadata = metadata
+        self.load_debate = load_debate
+        self.loaded = False
+        self.log_lines = 0
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.doc_ids: list[str | None] = []
+        self.doc_numbers: dict[str, int] = {}
+        self.doc_lengths = array("I")
+        self.doc_mtimes: dict[str, int] = {}
+        self.postings: dict[str, tuple[array, array]] = {}
+        self.total_length = 0
+
+    @property
+    def document_count(self) -> int:
+        return len(self.doc_numbers)
+
+    def record(self, debate: dict, mtime_ns: int):
+        """Index a debate that was just saved"""
+        with self._lock:
+            self._ensure_loaded()
+            terms = weighted_terms(debate)
+            self._add(debate["debate_id"], terms, mtime_ns)
+            self._append(debate["debate_id"], terms, mtime_ns)
+
+    def refresh(self) -> int:
+        """Index new or changed debates and drop deleted ones; returns how many were read"""
+        with self._lock:
+            self._ensure_loaded()
+            mtimes = self.metadata.mtimes()
+            reread = 0
+
+            for debate_id in set(self.doc_numbers) - set(mtimes):
+                self._remove(debate_id)
+
+            for debate_id, mtime_ns in mtimes.items():
+                if self.doc_mtimes.get(debate_id) == mtime_ns:
+                    continue
+
+                try:
+                    debate = self.load_debate(debate_id)
+                except (ValueError, FileNotFoundError) as e:
+                    logging.warning(f"Skipping debate {debate_id} in search index: {e}")
+                    continue
+
+                terms = weighted_terms(debate)
+                self._add(debate_id, terms, mtime_ns)
+                self._append(debate_id, terms, mtime_ns)
+                reread += 1
+
+            if self.log_lines > COMPACT_RATIO * max(self.document_count, 1):
+                self._compact()
+
+            return reread
+
+    def search(self, query: str, limit: int = 10) -> tuple[list[SearchHit], int]:
+        """Top debates for a query by BM25, with snippets, plus the total number of matches"""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return [], 0
+
+        with self._lock:
+            self.refresh()
+            scores = self._score(query_terms)
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+            ranked = [(self.doc_ids[number], score) for number, score in top]
+
+        hits = []
+        for debate_id, score in ranked:
+            try:
+                debate = self.load_debate(debate_id)
+            except (ValueError, FileNotFoundError):
+                continue
+
+            matched_in, snippet = make_snippet(debate, query_terms)
+            hits.append({
+                "debate_id": debate_id,
+                "prompt": debate["prompt"],
+                "timestamp": debate["timestamp"],
+                "score": round(score, 4),
+                "matched_in": matched_in,
+                "snippet": snippet
+            })
+
+        return hits, len(scores)
+
+    def _score(self, query_terms: set[str]) -> dict[int, float]:
+        count = self.document_count
+        average_length = self.total_length / count if count else 0.0
+        scores: dict[int, float] = {}
+
+        for term in query_terms:
+            if term not in self.postings:
+                continue
+
+            numbers, frequencies = self.postings[term]
+            live = [
+                (number, frequency)
+                for number, frequency in zip(numbers, frequencies)
+                if self.doc_ids[number] is not None
+            ]
+            if not live:
+                continue
+
+            idf = math.log(1 + (count - len(live) + 0.5) / (len(live) + 0.5))
+            for number, frequency in live:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[number] / average_length)
+                scores[number] = scores.get(number, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        return scores
+
+    def _add(self, debate_id: str, terms: Counter, mtime_ns: int):
+        self._remove(debate_id)
+
+        number = len(self.doc_ids)
+        length = sum(terms.values())
+        self.doc_ids.append(debate_id)
+        self.doc_numbers[debate_id] = number
+        self.doc_lengths.append(length)
+        self.doc_mtimes[debate_id] = mtime_ns
+        self.total_length += length
+
+        for term, frequency in terms.items():
+            numbers, frequencies = self.postings.setdefault(term, (array("I"), array("I")))
+            numbers.append(number)
+            frequencies.append(frequency)
+
+    def _remove(self, debate_id: str):
+        number = self.doc_numbers.pop(debate_id, None)
+        if number is None:
+            return
+
+        self.doc_ids[number] = None
+        self.doc_mtimes.pop(debate_id, None)
+        self.total_length -= self.doc_lengths[number]
+
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+
+        self.loaded = True
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    self.log_lines += 1
+                    try:
+                        record = json.loads(line)
+                        self._add(record["debate_id"], Counter(record["terms"]), record["mtime_ns"])
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        # A torn final line from a crash; refresh re-indexes that debate
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Failed to read search index, rebuilding: {e}")
+
+    def _append(self, debate_id: str, terms: Counter, mtime_ns: int):
+        if append_jsonl(self.path, {"debate_id": debate_id, "mtime_ns": mtime_ns, "terms": terms}):
+            self.log_lines += 1
+
+    def _compact(self):
+        """Rewrite the log with one line per live debate and renumber documents"""
+        documents: dict[int, Counter] = {number: Counter() for number in self.doc_numbers.values()}
+        for term, (numbers, frequencies) in self.postings.items():
+            for number, frequency in zip(numbers, frequencies):
+                if number in documents:
+                    documents[number][term] = frequency
+
+        records = [
+            {"debate_id": self.doc_ids[number], "mtime_ns": self.doc_mtimes[self.doc_ids[number]], "terms": terms}
+            for number, terms in sorted(documents.items())
+        ]
+
+        self._reset()
+        for record in records:
+            self._add(record["debate_id"], record["terms"], record["mtime_ns"])
+
+        if write_jsonl_atomic(self.path, records):
+            self.log_lines = len(records)
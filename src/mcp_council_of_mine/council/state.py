@@ -1,13 +1,33 @@
+import os
 import json
+import time
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import TypedDict
+from mcp_council_of_mine.config import env_float, env_int
+from mcp_council_of_mine.metrics import get_metrics
+from mcp_council_of_mine.tracing import span
+from mcp_council_of_mine.council.index import DebateIndex, DebateSummary, date_bound, decode_cursor
+from mcp_council_of_mine.council.search import SearchHit, SearchIndex
+from mcp_council_of_mine.council.persistence import DebateWriter
+from mcp_council_of_mine.council.storage import (
+    DEBATE_SUFFIX,
+    debate_paths,
+    decode_debate,
+    encode_debate,
+    get_layout,
+    shard_dir,
+)
 from mcp_council_of_mine.security import (
     validate_debate_id,
     sanitize_text,
 )
 
+DEFAULT_DEBATE_IDLE_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ACTIVE_DEBATES_PER_SESSION = 10
+
 
 class Opinion(TypedDict):
     member_id: int
@@ -21,7 +41,18 @@ class Vote(TypedDict):
     reasoning: str
 
 
-class DebateState(TypedDict):
+class Abstention(TypedDict):
+    member_id: int
+    member_name: str
+    reason: str
+
+
+class _OptionalDebateState(TypedDict, total=False):
+    ballot_samples: dict[int, list[int]]
+    abstentions: list[Abstention]
+
+
+class DebateState(_OptionalDebateState):
     debate_id: str
     prompt: str
     timestamp: str
@@ -31,16 +62,66 @@ class DebateState(TypedDict):
 
 
 class StateManager:
-    def __init__(self, debates_dir: str = "debates"):
-        self.debates_dir = Path(debates_dir)
-        self.debates_dir.mkdir(exist_ok=True)
-        self.current_debate: DebateState | None = None
+    """
+    Holds every active (unfinished) debate keyed by debate_id, along with the
+    client session that started it. Tools that are not given a debate_id act
+    on their session's latest debate, and a debate_id from another session
+    is rejected, so concurrent clients never touch each other's debates.
+    Callers that modify a debate across awaits should hold its debate_lock().
+
+    Debates that never reach get_results are dropped when a new debate
+    starts: any left idle for longer than COUNCIL_DEBATE_IDLE_TTL seconds,
+    and a session's oldest beyond COUNCIL_MAX_ACTIVE_DEBATES_PER_SESSION.
+    Debates whose lock is held are never dropped.
+    """
+
+    def __init__(self, debates_dir: str | None = None, layout: str | None = None):
+        self.debates_dir = Path(debates_dir or os.environ.get("COUNCIL_DEBATES_DIR") or "debates")
+        self.debates_dir.mkdir(parents=True, exist_ok=True)
+        self.layout = layout or get_layout()
+        self.index = DebateIndex(self.debates_dir)
+        self.search_index = SearchIndex(self.debates_dir, self.index, self.load_debate)
+        self.writer = DebateWriter(encode_debate, on_written=self._record_saved_debate)
+        self.active_debates: dict[str, DebateState] = {}
+        self.debate_sessions: dict[str, str | None] = {}
+        self.last_used: dict[str, float] = {}
+        self._last_issued: tuple[str, int] = ("", 0)
+        self.idle_ttl = env_float("COUNCIL_DEBATE_IDLE_TTL", DEFAULT_DEBATE_IDLE_TTL_SECONDS)
+        self.max_per_session = max(
+            1, env_int("COUNCIL_MAX_ACTIVE_DEBATES_PER_SESSION", DEFAULT_MAX_ACTIVE_DEBATES_PER_SESSION)
+        )
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def current_debate(self) -> DebateState | None:
+        """The most recently started active debate"""
+        return self.get_current_debate()
+
+    def _new_debate_id(self, timestamp: datetime) -> str:
+        base_id = timestamp.strftime("%Y%m%d_%H%M%S")
+
+        # Debates started within the same second get a numeric suffix. Suffixes
+        # only grow, so a dropped debate's id is never handed out again.
+        last_base_id, last_suffix = self._last_issued
+        suffix = last_suffix + 1 if base_id == last_base_id else 1
+        debate_id = base_id if suffix == 1 else f"{base_id}_{suffix}"
+
+        while (
+            debate_id in self.active_debates
+            or self.writer.pending_debate(debate_id)
+            or any(path.exists() for path in debate_paths(self.debates_dir, debate_id))
+        ):
+            suffix += 1
+            debate_id = f"{base_id}_{suffix}"
+
+        self._last_issued = (base_id, suffix)
+        return debate_id
 
-    def start_new_debate(self, prompt: str) -> str:
+    def start_new_debate(self, prompt: str, session_id: str | None = None) -> str:
         timestamp = datetime.now()
-        debate_id = timestamp.strftime("%Y%m%d_%H%M%S")
+        debate_id = self._new_debate_id(timestamp)
 
-        self.current_debate = {
+        self.active_debates[debate_id] = {
             "debate_id": debate_id,
             "prompt": prompt,
             "timestamp": timestamp.isoformat(),
@@ -49,107 +130,249 @@ class StateManager:
             "results": None
         }
 
+        self.debate_sessions[debate_id] = session_id
+        self.last_used[debate_id] = time.monotonic()
+
+        # The session's cap counts the debate just started
+        self._evict_abandoned_debates(session_id, keep=debate_id)
+
         return debate_id
 
-    def add_opinion(self, member_id: int, member_name: str, opinion: str):
-        if not self.current_debate:
-            raise ValueError("No active debate. Call start_new_debate first.")
+    def _evict_abandoned_debates(self, session_id: str | None, keep: str):
+        """Drop idle debates, and the session's oldest debates beyond its cap (never keep)"""
+        now = time.monotonic()
+        excess = sum(1 for owner in self.debate_sessions.values() if owner == session_id) - self.max_per_session
 
-        self.current_debate["opinions"][member_id] = {
-            "member_id": member_id,
-            "member_name": member_name,
-            "opinion": sanitize_text(opinion, max_length=2000)
-        }
+        for debate_id in list(self.active_debates):
+            if debate_id == keep:
+                continue
 
-    def add_vote(self, voter_id: int, voted_for_id: int, reasoning: str):
-        if not self.current_debate:
+            idle = self.idle_ttl > 0 and now - self.last_used.get(debate_id, now) > self.idle_ttl
+            over_cap = excess > 0 and self.debate_sessions.get(debate_id) == session_id
+            lock = self._locks.get(debate_id)
+            if not (idle or over_cap) or (lock is not None and lock.locked()):
+                # Locked debates have a tool call working on them
+                continue
+
+            if self.debate_sessions.get(debate_id) == session_id:
+                excess -= 1
+
+            logging.info(f"Dropping abandoned debate {debate_id}")
+            get_metrics().inc("council_abandoned_debates_total")
+            self._discard_debate(debate_id)
+
+    def resolve_debate_id(self, debate_id: str | None = None, session_id: str | None = None) -> str | None:
+        """
+        Pick the active debate a call refers to: the given debate_id, else the
+        session's latest debate, else (with no session) the latest debate overall.
+        With a session, a debate_id started by another session resolves to None.
+        """
+        if debate_id:
+            if debate_id not in self.active_debates:
+                return None
+            if session_id is not None and self.debate_sessions.get(debate_id) != session_id:
+                return None
+            return debate_id
+
+        candidates = self.list_active_debates(session_id)
+        return candidates[-1] if candidates else None
+
+    def debate_lock(self, debate_id: str) -> asyncio.Lock:
+        """Lock serializing tool calls that modify one debate"""
+        return self._locks.setdefault(debate_id, asyncio.Lock())
+
+    def _require_debate(self, debate_id: str | None) -> DebateState:
+        current = self.get_current_debate(debate_id)
+        if not current:
             raise ValueError("No active debate. Call start_new_debate first.")
+        return current
 
-        if voter_id == voted_for_id:
-            raise ValueError("Members cannot vote for themselves")
+    def add_opinion(self, member_id: int, member_name: str, opinion: str, debate_id: str | None = None):
+        current = self._require_debate(debate_id)
 
-        self.current_debate["votes"][voter_id] = {
-            "voter_id": voter_id,
-            "voted_for_id": voted_for_id,
-            "reasoning": sanitize_text(reasoning, max_length=1000)
-        }
+        with span("state/add_opinion", member_id=member_id):
+            current["opinions"][member_id] = {
+                "member_id": member_id,
+                "member_name": member_name,
+                "opinion": sanitize_text(opinion, max_length=2000)
+            }
 
-    def set_results(self, results: dict):
-        if not self.current_debate:
-            raise ValueError("No active debate. Call start_new_debate first.")
+    def add_vote(self, voter_id: int, voted_for_id: int, reasoning: str, debate_id: str | None = None):
+        current = self._require_debate(debate_id)
 
-        self.current_debate["results"] = results
+        if voter_id == voted_for_id:
+            raise ValueError("Members cannot vote for themselves")
 
-    def save_current_debate(self):
-        if not self.current_debate:
+        with span("state/add_vote", member_id=voter_id, voted_for_id=voted_for_id):
+            current["votes"][voter_id] = {
+                "voter_id": voter_id,
+                "voted_for_id": voted_for_id,
+                "reasoning": sanitize_text(reasoning, max_length=1000)
+            }
+
+    def set_ballot_samples(self, ballot_samples: dict[int, list[int]], debate_id: str | None = None):
+        """Record which opinions each voter reviewed in sampled voting"""
+        self._require_debate(debate_id)["ballot_samples"] = ballot_samples
+
+    def set_abstentions(self, abstentions: list[Abstention], debate_id: str | None = None):
+        """Record which members did not cast a vote and why"""
+        self._require_debate(debate_id)["abstentions"] = abstentions
+
+    def set_results(self, results: dict, debate_id: str | None = None):
+        self._require_debate(debate_id)["results"] = results
+
+    def save_current_debate(self, debate_id: str | None = None):
+        """
+        Queue a snapshot of the debate for the background writer and return
+        its path without waiting for the disk. load_debate serves the
+        snapshot until the file is written; call flush() to wait for it.
+        """
+        current = self.get_current_debate(debate_id)
+        if not current:
             raise ValueError("No active debate to save")
 
-        debate_id = self.current_debate["debate_id"]
-        file_path = self.debates_dir / f"{debate_id}.json"
+        debate_id = current["debate_id"]
+        directory = shard_dir(self.debates_dir, debate_id) if self.layout == "sharded" else self.debates_dir
+        file_path = directory / f"{debate_id}{DEBATE_SUFFIX}"
 
-        with open(file_path, 'w') as f:
-            json.dump(self.current_debate, f, indent=2)
+        with span("state/save", debate_id=debate_id):
+            # A JSON round trip is a cheap deep copy with the same shape as the file
+            snapshot = json.loads(json.dumps(current))
+            self.writer.submit(file_path, snapshot)
 
         return str(file_path)
 
+    def _record_saved_debate(self, debate: dict, file_path: Path):
+        """Runs on the writer thread once a debate file is on disk"""
+        mtime_ns = file_path.stat().st_mtime_ns
+        self.index.record(debate, mtime_ns, file_path)
+        self.search_index.record(debate, mtime_ns)
+
+    def flush(self):
+        """Wait until every saved debate is on disk and indexed"""
+        self.writer.flush()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self.writer.close()
+
     def load_debate(self, debate_id: str) -> DebateState:
         if not validate_debate_id(debate_id):
-            raise ValueError("Invalid debate_id format. Expected: YYYYMMDD_HHMMSS")
+            raise ValueError("Invalid debate_id format. Expected: YYYYMMDD_HHMMSS[_N]")
 
-        file_path = self.debates_dir / f"{debate_id}.json"
+        # The debate may be in its date shard or the flat directory, in either
+        # format; the current format and the shard win when there are copies
+        candidates = debate_paths(self.debates_dir, debate_id)
 
         try:
-            resolved_path = file_path.resolve()
             debates_dir_resolved = self.debates_dir.resolve()
 
-            if not resolved_path.is_relative_to(debates_dir_resolved):
-                logging.error(f"Path traversal attempt detected: {debate_id}")
-                raise ValueError("Invalid debate_id: path traversal detected")
+            for candidate in candidates:
+                if not candidate.resolve().is_relative_to(debates_dir_resolved):
+                    logging.error(f"Path traversal attempt detected: {debate_id}")
+                    raise ValueError("Invalid debate_id: path traversal detected")
         except (ValueError, OSError) as e:
             logging.error(f"Path validation failed for debate_id {debate_id}: {e}")
             raise ValueError("Invalid debate_id")
 
-        if not file_path.exists():
+        pending = self.writer.pending_debate(debate_id)
+        if pending is not None:
+            return json.loads(json.dumps(pending))
+
+        file_path = next((candidate for candidate in candidates if candidate.exists()), None)
+        if file_path is None:
             raise FileNotFoundError(f"Debate {debate_id} not found")
 
         try:
-            with open(file_path, 'r') as f:
-                debate = json.load(f)
-        except json.JSONDecodeError:
-            logging.error(f"Corrupted debate file: {debate_id}")
+            with span("state/load", debate_id=debate_id), get_metrics().timer("council_debate_load_seconds"):
+                debate = decode_debate(file_path.read_bytes())
+        except ValueError as e:
+            logging.error(f"Corrupted debate file {debate_id}: {e}")
             raise ValueError("Debate file is corrupted")
 
         logging.info(f"Successfully loaded debate: {debate_id}")
         return debate
 
-    def list_debates(self) -> list[dict]:
-        debate_files = sorted(self.debates_dir.glob("*.json"), reverse=True)
-        debates = []
-
-        for file_path in debate_files:
-            try:
-                with open(file_path, 'r') as f:
-                    debate = json.load(f)
-                    debates.append({
-                        "debate_id": debate["debate_id"],
-                        "prompt": debate["prompt"],
-                        "timestamp": debate["timestamp"],
-                        "has_results": debate.get("results") is not None
-                    })
-            except (json.JSONDecodeError, KeyError) as e:
-                logging.warning(f"Skipping invalid debate file {file_path}: {e}")
-                continue
+    def list_debates(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        has_results: bool | None = None
+    ) -> list[DebateSummary]:
+        """
+        Saved debates, newest first, served from the metadata index.
+        cursor continues after the debate it encodes (see encode_cursor);
+        since/until are inclusive ISO dates or datetimes.
+        """
+        before_id = decode_cursor(cursor) if cursor else None
+        since_id = date_bound(since) if since else None
+        until_id = date_bound(until, end=True) if until else None
+
+        # Debates still in the write-behind queue are listed from their
+        # snapshots. Taken before reading the index: a debate leaves pending
+        # only after it has been recorded there.
+        pending = self.writer.pending_debates()
+
+        with span("state/list"), get_metrics().timer("council_list_debates_seconds"):
+            return self.index.summaries(limit, before_id, since_id, until_id, has_results, pending)
+
+    def count_debates(self) -> int:
+        return self.index.count(self.writer.pending_debates())
+
+    def search_debates(self, query: str, limit: int = 10) -> tuple[list[SearchHit], int]:
+        """
+        Ranked full-text search over saved debates; returns (hits, total matches).
+        Waits for pending writes so they are indexed, so call it off the event loop.
+        """
+        self.writer.flush()
+
+        with span("state/search"), get_metrics().timer("council_search_debates_seconds"):
+            return self.search_index.search(query, limit)
+
+    def get_current_debate(self, debate_id: str | None = None, session_id: str | None = None) -> DebateState | None:
+        resolved_id = self.resolve_debate_id(debate_id, session_id)
+        if not resolved_id:
+            return None
+
+        self.last_used[resolved_id] = time.monotonic()
+        return self.active_debates.get(resolved_id)
+
+    def list_active_debates(self, session_id: str | None = None) -> list[str]:
+        """IDs of unfinished debates, optionally only those started by one session"""
+        if session_id is None:
+            return list(self.active_debates)
+
+        return [
+            debate_id for debate_id in self.active_debates
+            if self.debate_sessions.get(debate_id) == session_id
+        ]
+
+    def clear_current_debate(self, debate_id: str | None = None):
+        resolved_id = self.resolve_debate_id(debate_id)
+        if resolved_id:
+            self._discard_debate(resolved_id)
+
+    def _discard_debate(self, debate_id: str):
+        self.active_debates.pop(debate_id, None)
+        self.debate_sessions.pop(debate_id, None)
+        self.last_used.pop(debate_id, None)
+        self._locks.pop(debate_id, None)
 
-        return debates
 
-    def get_current_debate(self) -> DebateState | None:
-        return self.current_debate
+_state_manager = StateManager()
 
-    def clear_current_debate(self):
-        self.current_debate = None
 
+def get_session_id(ctx) -> str | None:
+    """Client session of a tool call, or None outside a request"""
+    if ctx is None:
+        return None
 
-_state_manager = StateManager()
+    try:
+        return ctx.session_id
+    except (RuntimeError, ValueError, AttributeError):
+        return None
 
 
 def get_state_manager() -> StateManager:
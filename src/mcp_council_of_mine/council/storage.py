@@ -0,0 +1,107 @@
+import os
+import json
+import zlib
+from pathlib import Path
+from mcp_council_of_mine.config import env_int
+
+# Version 1 is the original pretty-printed <debate_id>.json; version 2 is a
+# one-line header followed by minified JSON, optionally zlib-compressed.
+FORMAT_VERSION = 2
+MAGIC = b"COUNCIL-DEBATE"
+DEBATE_SUFFIX = ".debate"
+LEGACY_SUFFIX = ".json"
+# Preferred first: when both exist (mid-migration) the new format wins
+DEBATE_SUFFIXES = (DEBATE_SUFFIX, LEGACY_SUFFIX)
+COMPRESSIONS = ("zlib", "none")
+DEFAULT_COMPRESSION = "zlib"
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Debates are written to debates/YYYY/MM/DD/ ("sharded") or directly into
+# debates/ ("flat"). Reads always look in both places.
+LAYOUTS = ("sharded", "flat")
+DEFAULT_LAYOUT = "sharded"
+YEAR_GLOB = "[0-9]" * 4
+MONTH_GLOB = f"{YEAR_GLOB}/[0-9][0-9]"
+DAY_GLOB = f"{MONTH_GLOB}/[0-9][0-9]"
+
+
+def get_layout() -> str:
+    """Directory layout for newly saved debates, via COUNCIL_DEBATES_LAYOUT (sharded or flat)"""
+    layout = os.environ.get("COUNCIL_DEBATES_LAYOUT", DEFAULT_LAYOUT).strip().lower()
+    return layout if layout in LAYOUTS else DEFAULT_LAYOUT
+
+
+def shard_dir(debates_dir: Path, debate_id: str) -> Path:
+    """debates/YYYY/MM/DD for a (validated) debate_id, which starts with YYYYMMDD"""
+    return debates_dir / debate_id[:4] / debate_id[4:6] / debate_id[6:8]
+
+
+def debate_paths(debates_dir: Path, debate_id: str) -> list[Path]:
+    """Every file a debate may live in, most preferred first: current format, then sharded"""
+    return [
+        directory / f"{debate_id}{suffix}"
+        for suffix in DEBATE_SUFFIXES
+        for directory in (shard_dir(debates_dir, debate_id), debates_dir)
+    ]
+
+
+def shard_dirs(debates_dir: Path) -> list[Path]:
+    """Existing day directories, oldest first"""
+    return sorted(path for path in debates_dir.glob(DAY_GLOB) if path.is_dir())
+
+
+def get_compression() -> str:
+    """Codec for newly saved debates, via COUNCIL_DEBATE_COMPRESSION (zlib or none)"""
+    compression = os.environ.get("COUNCIL_DEBATE_COMPRESSION", DEFAULT_COMPRESSION).strip().lower()
+    return compression if compression in COMPRESSIONS else DEFAULT_COMPRESSION
+
+
+def encode_debate(debate: dict, compression: str | None = None) -> bytes:
+    """Serialize a debate in the current format: header line, then the (compressed) body"""
+    compression = compression or get_compression()
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    body = json.dumps(debate, separators=(",", ":"), ensure_ascii=False).encode()
+    if compression == "zlib":
+        level = min(max(env_int("COUNCIL_DEBATE_COMPRESSION_LEVEL", DEFAULT_COMPRESSION_LEVEL), 1), 9)
+        body = zlib.compress(body, level)
+
+    return MAGIC + f" {FORMAT_VERSION} {compression}\n".encode() + body
+
+
+def decode_debate(data: bytes) -> dict:
+    """Parse either format; raises ValueError for corrupt or unsupported files"""
+    if not data.startswith(MAGIC):
+        # Version 1: plain JSON
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupted debate file: {e}")
+
+    header, _, body = data.partition(b"\n")
+    try:
+        _, version, compression = header.decode().split()
+        version = int(version)
+    except ValueError:
+        raise ValueError("Corrupted debate file header")
+
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Debate file format version {version} is newer than this server supports")
+
+    try:
+        if compression == "zlib":
+            body = zlib.decompress(body)
+        elif compression != "none":
+            raise ValueError(f"Unknown debate compression: {compression}")
+        return json.loads(body)
+    except (zlib.error, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupted debate file: {e}")
+
+
+def split_debate_filename(name: str) -> tuple[str, str] | None:
+    """(debate_id, suffix) for a debate file name in either format, else None"""
+    for suffix in DEBATE_SUFFIXES:
+        if name.endswith(suffix) and not name.startswith("."):
+            return name[:-len(suffix)], suffix
+    return None
@@ -0,0 +1,129 @@
+import math
+import random
+from collections import Counter
+
+BOOTSTRAP_ROUNDS = 1000
+
+
+def ballot_seed(debate_id: str, voter_id: int) -> str:
+    """Per-voter seed so a debate's sampled ballots are reproducible"""
+    return f"{debate_id}:{voter_id}"
+
+
+def select_ballot_subset(
+    voter_id: int,
+    opinion_ids: list[int],
+    sample_size: int,
+    seed: str,
+    exposures: Counter | None = None,
+    strategy: str = "stratified"
+) -> list[int]:
+    """
+    Choose which opinions a voter reviews, never including their own.
+    "random" draws a uniform sample; "stratified" prefers the opinions shown
+    least often so far so exposure stays balanced across the council.
+    Ties are broken with the voter's seed, and the subset is returned sorted.
+    """
+    rng = random.Random(seed)
+    candidates = sorted(op_id for op_id in opinion_ids if op_id != voter_id)
+
+    if sample_size >= len(candidates):
+        return candidates
+
+    if strategy == "random":
+        return sorted(rng.sample(candidates, sample_size))
+
+    exposures = exposures if exposures is not None else Counter()
+    tie_breakers = {op_id: rng.random() for op_id in candidates}
+    ranked = sorted(candidates, key=lambda op_id: (exposures[op_id], tie_breakers[op_id]))
+    return sorted(ranked[:sample_size])
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score interval for a vote rate (95% by default)"""
+    if trials == 0:
+        return 0.0, 0.0
+
+    p = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (p + z ** 2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def normalized_scores(votes: list[int], exposures: Counter) -> dict[int, float]:
+    """Votes per time shown for every opinion that was shown at least once"""
+    vote_counts = Counter(votes)
+    return {
+        op_id: vote_counts[op_id] / shown
+        for op_id, shown in exposures.items()
+        if shown
+    }
+
+
+def top_scoring(scores: dict[int, float]) -> list[int]:
+    if not scores:
+        return []
+
+    best = max(scores.values())
+    if best == 0:
+        return []
+
+    return sorted(op_id for op_id, score in scores.items() if score == best)
+
+
+def outcome_is_decided(vote_counts: Counter, remaining_ballots: int) -> bool:
+    """
+    True once the leading opinion is guaranteed to be the sole winner, i.e.
+    even if every remaining ballot went to the runner-up it would still trail.
+    """
+    ranked = vote_counts.most_common(2)
+    if not ranked:
+        return False
+
+    leader_votes = ranked[0][1]
+    runner_up_votes = ranked[1][1] if len(ranked) > 1 else 0
+    return leader_votes > runner_up_votes + remaining_ballots
+
+
+def tally_sampled_ballots(ballots: dict[int, tuple[list[int], int]], seed: str) -> dict:
+    """
+    Tally ballots where each voter only saw a subset of opinions.
+    ballots maps voter_id -> (ids shown to the voter, id voted for).
+    Returns exposure counts, normalized scores, winners by score, a Wilson
+    interval per opinion and a bootstrap estimate of how often the same
+    winner comes out on top when voters are resampled.
+    """
+    exposures = Counter(op_id for shown, _ in ballots.values() for op_id in shown)
+    votes = [voted_for for _, voted_for in ballots.values()]
+    vote_counts = Counter(votes)
+    scores = normalized_scores(votes, exposures)
+    winners = top_scoring(scores)
+
+    intervals = {
+        op_id: [round(bound, 3) for bound in wilson_interval(vote_counts[op_id], shown)]
+        for op_id, shown in exposures.items()
+    }
+
+    winner_confidence = 0.0
+    voter_ids = sorted(ballots)
+    if winners and voter_ids:
+        rng = random.Random(seed)
+        leader = winners[0]
+        stable = 0
+        for _ in range(BOOTSTRAP_ROUNDS):
+            resample = [ballots[rng.choice(voter_ids)] for _ in voter_ids]
+            sample_exposures = Counter(op_id for shown, _ in resample for op_id in shown)
+            sample_scores = normalized_scores([voted for _, voted in resample], sample_exposures)
+            if leader in top_scoring(sample_scores):
+                stable += 1
+        winner_confidence = stable / BOOTSTRAP_ROUNDS
+
+    return {
+        "exposures": dict(exposures),
+        "vote_counts": dict(vote_counts),
+        "normalized_scores": {op_id: round(score, 3) for op_id, score in scores.items()},
+        "winners": winners,
+        "confidence_intervals": intervals,
+        "winner_confidence": round(winner_confidence, 3)
+    }
@@ -0,0 +1,314 @@
+import os
+import re
+import json
+import random
+import asyncio
+import hashlib
+from collections import Counter
+from mcp.types import TextContent
+from mcp_council_of_mine.config import env_float
+from mcp_council_of_mine.council.members import get_all_members
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+
+MEMBER_IN_PROMPT = re.compile(r'(?:You are|As) (The [^(\n]+?) \(the ')
+OPINION_IN_PROMPT = re.compile(r'^Opinion (\d+) \(by ', re.MULTILINE)
+MEMBER_LINE = re.compile(r'^Member (\d+): ', re.MULTILINE)
+USER_TOPIC = re.compile(r'=== (?:DEBATE TOPIC|STATEMENT)[^\n]*===\n(.*?)\n=== END', re.DOTALL)
+
+OPENINGS = [
+    "From where I stand, {topic} deserves a careful answer.",
+    "My first instinct on {topic} is to look past the obvious.",
+    "{topic} comes down to trade-offs we should name explicitly.",
+    "On {topic}, I think the council should be clear about what success means.",
+]
+SUPPORT = [
+    "**Start small**, measure the outcome, and expand only what works.",
+    "The long-term effects matter more than the first few weeks.",
+    "The people affected most should shape the decision.",
+    "Proven approaches exist and we should learn from them first.",
+    "The data we have is thin, so we should collect more before committing.",
+    "There is a version of this that everyone can support.",
+]
+REASONS = [
+    "It balances ambition with a realistic path forward.",
+    "It reflects the values I care about most.",
+    "It addresses the risks the others overlook.",
+    "It puts the people affected at the center.",
+]
+MALFORMED_BALLOTS = [
+    "I find all of these opinions compelling in different ways.",
+    "VOTE: {own}\nREASONING: My own view is still the strongest.",
+    "VOTE: 42\nREASONING: None of the listed opinions, honestly.",
+]
+
+
+class SimulatedSamplingError(TimeoutError):
+    """Injected sampling failure; a TimeoutError so it is treated as transient"""
+
+
+class LatencyModel:
+    """
+    Simulated sampling latency in seconds.
+    Each call draws from `distribution` around `median` (spread controls the
+    width: sigma for lognormal/normal, +/- range for uniform), adds
+    per_token * max_tokens to model longer completions, and then applies
+    +/- `jitter` as a fraction of the result. time_scale shrinks everything
+    uniformly so tests can run the same model quickly.
+    """
+
+    def __init__(
+        self,
+        distribution: str = "lognormal",
+        median: float = 0.5,
+        spread: float = 0.5,
+        per_token: float = 0.0,
+        jitter: float = 0.0,
+        time_scale: float = 1.0
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+
+        self.distribution = distribution
+        self.median = median
+        self.spread = spread
+        self.per_token = per_token
+        self.jitter = jitter
+        self.time_scale = time_scale
+
+    def draw(self, rng: random.Random, max_tokens: int = 0) -> float:
+        if self.distribution == "constant":
+            seconds = self.median
+        elif self.distribution == "uniform":
+            seconds = rng.uniform(self.median - self.spread, self.median + self.spread)
+        elif self.distribution == "normal":
+            seconds = rng.gauss(self.median, self.spread * self.median)
+        elif self.distribution == "exponential":
+            seconds = rng.expovariate(1 / self.median) if self.median > 0 else 0.0
+        else:
+            seconds = rng.lognormvariate(0, self.spread) * self.median
+
+        seconds += self.per_token * max_tokens
+        if self.jitter:
+            seconds *= 1 + rng.uniform(-self.jitter, self.jitter)
+
+        return max(0.0, seconds) * self.time_scale
+
+
+class FakeSamplingBackend:
+    """
+    Deterministic, member-aware stand-in for client sampling.
+    Responses depend only on the seed and the prompt, so the same debate
+    produces the same opinions and ballots regardless of call order or
+    timing. Each repeated call for a prompt draws fresh latency and failure
+    outcomes (so retries can succeed), still reproducibly.
+
+    failure_rate is the chance a call raises SimulatedSamplingError and
+    malformed_rate the chance a ballot is unusable (no vote, a self-vote or
+    an unknown opinion) or a member is left out of a batched response.
+    """
+
+    def __init__(
+        self,
+        seed: str = "council",
+        latency: LatencyModel | None = None,
+        failure_rate: float = 0.0,
+        malformed_rate: float = 0.0
+    ):
+        self.seed = seed
+        self.latency = latency or LatencyModel(distribution="constant", median=0.0)
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.members = {member["id"]: member for member in get_all_members()}
+        self.ids_by_name = {member["name"]: member["id"] for member in self.members.values()}
+        self.attempts = Counter()
+        self.calls = Counter()
+        self.failures = Counter()
+        self.prompt_chars = Counter()
+        self.response_chars = Counter()
+
+    def _rng(self, *parts) -> random.Random:
+        digest = hashlib.sha256(":".join(str(part) for part in (self.seed, *parts)).encode()).hexdigest()
+        return random.Random(digest)
+
+    @staticmethod
+    def classify(prompt: str) -> str:
+        """Which kind of council prompt this is, used for responses and stats"""
+        if "simulating the voting round" in prompt:
+            return "batched_ballots"
+        if "simulating a council" in prompt:
+            return "batched_stances" if "STANCE:" in prompt else "batched_opinions"
+        if "VOTE: [opinion number]" in prompt:
+            return "ballot"
+        if "STANCE: [agree" in prompt:
+            return "stance"
+        if "Generate a balanced synthesis" in prompt:
+            return "synthesis"
+        return "opinion"
+
+    async def sample(
+        self,
+        messages: str,
+        system_prompt: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **kwargs
+    ) -> TextContent:
+        """Same call shape as Context.sample"""
+        prompt = messages if isinstance(messages, str) else str(messages)
+        full_prompt = f"{system_prompt or ''}\n\n{prompt}"
+        kind = self.classify(prompt)
+        prompt_key = hashlib.sha256(full_prompt.encode()).hexdigest()
+
+        self.attempts[prompt_key] += 1
+        self.calls[kind] += 1
+        self.prompt_chars[kind] += len(full_prompt)
+
+        call_rng = self._rng("call", prompt_key, self.attempts[prompt_key])
+        await asyncio.sleep(self.latency.draw(call_rng, max_tokens or 0))
+
+        if call_rng.random() < self.failure_rate:
+            self.failures[kind] += 1
+            raise SimulatedSamplingError(f"Simulated {kind} sampling failure")
+
+        text = self.respond(kind, full_prompt, self._rng("response", prompt_key))
+        self.response_chars[kind] += len(text)
+        return TextContent(type="text", text=text)
+
+    def respond(self, kind: str, prompt: str, rng: random.Random) -> str:
+        topic_match = USER_TOPIC.search(prompt)
+        topic = topic_match.group(1).strip()[:80] if topic_match else "this topic"
+
+        if kind == "batched_opinions":
+            return json.dumps({
+                str(member_id): self._opinion(member_id, topic)
+                for member_id in self._listed_members(prompt)
+                if rng.random() >= self.malformed_rate
+            })
+
+        if kind == "batched_ballots":
+            candidates = [int(op_id) for op_id in OPINION_IN_PROMPT.findall(prompt)]
+            blocks = [
+                f"MEMBER {member_id}:\n{self._ballot(member_id, candidates, rng)}"
+                for member_id in self._listed_members(prompt)
+                if rng.random() >= self.malformed_rate
+            ]
+            return "\n\n".join(blocks)
+
+        if kind == "batched_stances":
+            return "\n\n".join(
+                f"MEMBER {member_id}:\n{self._stance(member_id, topic)}"
+                for member_id in self._listed_members(prompt)
+                if rng.random() >= self.malformed_rate
+            )
+
+        member_id = self._prompt_member(prompt)
+
+        if kind == "ballot":
+            candidates = [int(op_id) for op_id in OPINION_IN_PROMPT.findall(prompt)]
+            if rng.random() < self.malformed_rate:
+                return rng.choice(MALFORMED_BALLOTS).format(own=member_id or 1)
+            return self._ballot(member_id, candidates, rng)
+
+        if kind == "stance":
+            return self._stance(member_id, topic)
+
+        if kind == "synthesis":
+            return (
+                f"The council's winning view on {topic} favors a measured approach. "
+                f"{rng.choice(SUPPORT)} Other members added useful caveats, "
+                "and the council agrees to revisit the decision with new evidence."
+            )
+
+        return self._opinion(member_id, topic)
+
+    def _prompt_member(self, prompt: str) -> int | None:
+        match = MEMBER_IN_PROMPT.search(prompt)
+        return self.ids_by_name.get(match.group(1)) if match else None
+
+    def _listed_members(self, prompt: str) -> list[int]:
+        return [int(member_id) for member_id in MEMBER_LINE.findall(prompt) if int(member_id) in self.members]
+
+    def _opinion(self, member_id: int | None, topic: str) -> str:
+        rng = self._rng("opinion", member_id, topic)
+        archetype = self.members[member_id]["archetype"] if member_id in self.members else "Member"
+        return (
+            f"As the {archetype}: {rng.choice(OPENINGS).format(topic=topic)} "
+            f"{rng.choice(SUPPORT)} {rng.choice(SUPPORT)}"
+        )
+
+    def _ballot(self, member_id: int | None, candidates: list[int], rng: random.Random) -> str:
+        choices = [op_id for op_id in candidates if op_id != member_id]
+        if not choices:
+            return "There is nothing for me to vote for."
+
+        # Members consistently prefer some colleagues over others
+        vote_id = max(choices, key=lambda op_id: self._rng("affinity", member_id, op_id).random())
+        return f"VOTE: {vote_id}\nREASONING: {rng.choice(REASONS)}"
+
+    def _stance(self, member_id: int | None, topic: str) -> str:
+        rng = self._rng("stance", member_id, topic)
+        stance = rng.choice(["agree", "agree", "disagree", "neutral"])
+        return f"STANCE: {stance}\nREASON: {rng.choice(REASONS)}"
+
+    def stats(self) -> dict:
+        return {
+            "calls": dict(self.calls),
+            "failures": dict(self.failures),
+            "prompt_chars": dict(self.prompt_chars),
+            "response_chars": dict(self.response_chars)
+        }
+
+    @classmethod
+    def from_env(cls) -> "FakeSamplingBackend":
+        """
+        Backend configured via COUNCIL_FAKE_SEED, COUNCIL_FAKE_LATENCY (median
+        seconds, lognormal), COUNCIL_FAKE_JITTER, COUNCIL_FAKE_FAILURE_RATE and
+        COUNCIL_FAKE_MALFORMED_RATE.
+        """
+        return cls(
+            seed=os.environ.get("COUNCIL_FAKE_SEED", "council"),
+            latency=LatencyModel(
+                median=env_float("COUNCIL_FAKE_LATENCY", 0.5),
+                jitter=env_float("COUNCIL_FAKE_JITTER", 0.0)
+            ),
+            failure_rate=env_float("COUNCIL_FAKE_FAILURE_RATE", 0.0),
+            malformed_rate=env_float("COUNCIL_FAKE_MALFORMED_RATE", 0.0)
+        )
+
+
+class FakeContext:
+    """
+    Minimal stand-in for fastmcp's Context that samples from a
+    FakeSamplingBackend and records what the tools report to the client.
+    """
+
+    def __init__(self, backend: FakeSamplingBackend | None = None, session_id: str = "fake-session"):
+        self.backend = backend or FakeSamplingBackend()
+        self.session_id = session_id
+        self.messages: list[tuple[str, str]] = []
+        self.progress: list[tuple[float, float | None, str | None]] = []
+        self.partials: list[dict] = []
+
+    async def sample(self, messages, **kwargs):
+        return await self.backend.sample(messages, **kwargs)
+
+    async def info(self, message: str, **kwargs):
+        self.messages.append(("info", message))
+
+    async def warning(self, message: str, **kwargs):
+        self.messages.append(("warning", message))
+
+    async def debug(self, message: str, **kwargs):
+        self.messages.append(("debug", message))
+
+    async def error(self, message: str, **kwargs):
+        self.messages.append(("error", message))
+
+    async def log(self, message: str, level=None, logger_name=None, extra=None):
+        self.messages.append((level or "info", message))
+        if extra is not None:
+            self.partials.append(dict(extra))
+
+    async def report_progress(self, progress: float, total: float | None = None, message: str | None = None):
+        self.progress.append((progress, total, message))
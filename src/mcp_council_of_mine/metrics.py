@@ -0,0 +1,202 @@
+import os
+import time
+import bisect
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from mcp_council_of_mine.config import env_float
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+DEFAULT_FILE_INTERVAL_SECONDS = 10.0
+
+METRIC_HELP = {
+    "council_sampling_calls_total": "Sampling calls sent to the client, by phase",
+    "council_sampling_failures_total": "Sampling calls that failed after retries, by phase",
+    "council_sampling_cache_hits_total": "Sampling calls answered from the response cache, by phase",
+    "council_sampling_latency_seconds": "Sampling latency including retries, by phase",
+    "council_prompt_chars": "Prompt size in characters, by phase",
+    "council_response_chars": "Response size in characters, by phase",
+    "council_invalid_ballots_total": "Ballots that were missing, unparseable or against the rules",
+    "council_debate_save_seconds": "Time to write a debate to disk on the background writer",
+    "council_debate_save_failures_total": "Debates the background writer failed to save",
+    "council_debate_load_seconds": "Time to load a debate from disk",
+    "council_list_debates_seconds": "Time to list saved debates",
+    "council_search_debates_seconds": "Time to search debate history, including snippet extraction",
+    "council_index_reread_files_total": "Debate files re-read to bring the metadata index up to date",
+    "council_abandoned_debates_total": "Unfinished debates dropped for being idle or over the per-session cap",
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram: cumulative-friendly counts plus sum and count"""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": {
+                str(bound): count for bound, count in zip((*self.buckets, "+Inf"), self.counts)
+            }
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms keyed by name and labels.
+    Recording is a dict lookup and an increment under a lock, cheap enough
+    to leave on in production. snapshot() feeds the get_council_metrics
+    tool and to_prometheus() renders the Prometheus text format.
+    """
+
+    def __init__(self, prometheus_file: str | None = None, file_interval: float = DEFAULT_FILE_INTERVAL_SECONDS):
+        self.counters: dict[tuple, float] = {}
+        self.histograms: dict[tuple, Histogram] = {}
+        self.prometheus_file = prometheus_file
+        self.file_interval = file_interval
+        self.last_written = 0.0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> dict:
+        def series_name(key: tuple) -> str:
+            name, labels = key
+            if not labels:
+                return name
+            return name + "{" + ",".join(f"{label}={value}" for label, value in labels) + "}"
+
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "counters": {series_name(key): value for key, value in sorted(self.counters.items())},
+                "histograms": {
+                    series_name(key): histogram.snapshot()
+                    for key, histogram in sorted(self.histograms.items())
+                }
+            }
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        def label_text(labels: tuple, extra: tuple = ()) -> str:
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{label}="{value}"' for label, value in pairs) + "}"
+
+        lines = []
+        described = set()
+
+        def describe(name: str, metric_type: str):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                describe(name, "counter")
+                lines.append(f"{name}{label_text(labels)} {value}")
+
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                describe(name, "histogram")
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{label_text(labels, (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{label_text(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | None = None) -> str | None:
+        """Atomically write the Prometheus text file (e.g. for node_exporter's textfile collector)"""
+        path = path or self.prometheus_file
+        if not path:
+            return None
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, target)
+        except OSError as e:
+            logging.warning(f"Failed to write metrics file {target}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+            return None
+
+        self.last_written = time.monotonic()
+        return str(target)
+
+    def flush(self):
+        """Write the Prometheus file if one is configured and the interval has passed"""
+        if self.prometheus_file and time.monotonic() - self.last_written >= self.file_interval:
+            self.write_prometheus()
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+
+_metrics: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Shared metrics registry. Set COUNCIL_METRICS_FILE to also write the
+    Prometheus text format to that path after tool calls, at most every
+    COUNCIL_METRICS_FILE_INTERVAL seconds (default 10).
+    """
+    global _metrics
+
+    if _metrics is None:
+        _metrics = MetricsRegistry(
+            prometheus_file=os.environ.get("COUNCIL_METRICS_FILE") or None,
+            file_interval=env_float("COUNCIL_METRICS_FILE_INTERVAL", DEFAULT_FILE_INTERVAL_SECONDS)
+        )
+
+    return _metrics
@@ -0,0 +1,187 @@
+"""
+Offline migration of saved debates to the current storage format and layout.
+
+Converts legacy pretty-printed <debate_id>.json files into compact
+<debate_id>.debate files (versioned header, minified and optionally
+compressed JSON), moves debates from the flat directory into
+debates/YYYY/MM/DD/ shards (or back, with --layout flat), then brings the
+listing and search indexes up to date. The server reads both layouts, so
+it can run before the migration finishes, but stop it while migrating.
+Run with --dry-run to see what would change:
+
+    python -m mcp_council_of_mine.migrate --debates-dir debates --dry-run
+"""
+
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+from mcp_council_of_mine.security import validate_debate_id
+from mcp_council_of_mine.council.persistence import write_atomic
+from mcp_council_of_mine.council.storage import (
+    COMPRESSIONS,
+    DAY_GLOB,
+    DEBATE_SUFFIX,
+    LAYOUTS,
+    LEGACY_SUFFIX,
+    decode_debate,
+    encode_debate,
+    get_compression,
+    get_layout,
+    shard_dir,
+    shard_dirs,
+    split_debate_filename,
+)
+
+
+def migrate_format(
+    debates_dir: Path,
+    compression: str | None = None,
+    keep_legacy: bool = False,
+    dry_run: bool = False
+) -> dict:
+    """Convert every legacy debate file; returns counts and byte totals"""
+    report = {"converted": 0, "already_migrated": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+
+    legacy_paths = [*debates_dir.glob(f"*{LEGACY_SUFFIX}"), *debates_dir.glob(f"{DAY_GLOB}/*{LEGACY_SUFFIX}")]
+
+    for legacy_path in sorted(legacy_paths):
+        debate_id = legacy_path.name[:-len(LEGACY_SUFFIX)]
+        if not validate_debate_id(debate_id):
+            continue
+
+        target = legacy_path.parent / f"{debate_id}{DEBATE_SUFFIX}"
+        if target.exists():
+            # Converted by an earlier, interrupted run
+            report["already_migrated"] += 1
+            if not keep_legacy and not dry_run:
+                legacy_path.unlink()
+            continue
+
+        try:
+            data = legacy_path.read_bytes()
+            debate = decode_debate(data)
+            if debate.get("debate_id") != debate_id:
+                raise ValueError(f"file contains debate {debate.get('debate_id')!r}")
+            encoded = encode_debate(debate, compression)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping {legacy_path.name}: {e}")
+            report["failed"] += 1
+            continue
+
+        if not dry_run:
+            write_atomic(target, encoded)
+            if not keep_legacy:
+                legacy_path.unlink()
+
+        report["converted"] += 1
+        report["bytes_before"] += len(data)
+        report["bytes_after"] += len(encoded)
+
+    return report
+
+
+def migrate_layout(debates_dir: Path, layout: str = "sharded", dry_run: bool = False) -> dict:
+    """
+    Move debate files into their date shards (or back into the flat
+    directory). Renames keep file mtimes, so the indexes stay valid.
+    A debate already present at the destination is left in place.
+    """
+    report = {"moved": 0, "conflicts": 0}
+    sources = [debates_dir] if layout == "sharded" else shard_dirs(debates_dir)
+
+    for directory in sources:
+        for path in sorted(directory.iterdir()):
+            parsed = split_debate_filename(path.name)
+            if not parsed or not path.is_file() or not validate_debate_id(parsed[0]):
+                continue
+
+            debate_id, _ = parsed
+            target_dir = shard_dir(debates_dir, debate_id) if layout == "sharded" else debates_dir
+            target = target_dir / path.name
+            if target.exists():
+                logging.warning(f"Not moving {path}: {target} already exists")
+                report["conflicts"] += 1
+                continue
+
+            if not dry_run:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+            report["moved"] += 1
+
+    if layout == "flat" and not dry_run:
+        # Drop the now-empty day, month and year directories
+        for directory in sorted(shard_dirs(debates_dir), reverse=True):
+            for empty in (directory, directory.parent, directory.parent.parent):
+                try:
+                    empty.rmdir()
+                except OSError:
+                    break
+
+    return report
+
+
+def refresh_indexes(debates_dir: Path):
+    """Re-read the migrated debates into the listing and search indexes"""
+    from mcp_council_of_mine.council.state import StateManager
+
+    state = StateManager(debates_dir=str(debates_dir))
+    state.index.refresh()
+    state.search_index.refresh()
+
+
+def format_layout_report(report: dict, layout: str, dry_run: bool = False) -> str:
+    verb = "Would move" if dry_run else "Moved"
+    return f"{verb} {report['moved']} debate file(s) to the {layout} layout; {report['conflicts']} conflict(s)"
+
+
+def format_report(report: dict, dry_run: bool = False) -> str:
+    saved = report["bytes_before"] - report["bytes_after"]
+    ratio = report["bytes_after"] / report["bytes_before"] if report["bytes_before"] else 1.0
+    verb = "Would convert" if dry_run else "Converted"
+
+    return (
+        f"{verb} {report['converted']} debate(s): "
+        f"{report['bytes_before']:,} → {report['bytes_after']:,} bytes "
+        f"({ratio:.0%} of original, {saved:,} bytes saved); "
+        f"{report['already_migrated']} already migrated, {report['failed']} failed"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert saved debates to the compact storage format")
+    parser.add_argument("--debates-dir", default="debates", help="Debates directory (default: debates)")
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=get_compression(),
+        help="Codec for converted files (default: COUNCIL_DEBATE_COMPRESSION or zlib)"
+    )
+    parser.add_argument("--keep-legacy", action="store_true", help="Keep the original .json files")
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default=get_layout(),
+        help="Directory layout to move debates into (default: COUNCIL_DEBATES_LAYOUT or sharded)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args(argv)
+
+    debates_dir = Path(args.debates_dir)
+    if not debates_dir.is_dir():
+        print(f"No debates directory at {debates_dir}", file=sys.stderr)
+        return 1
+
+    report = migrate_format(debates_dir, args.compression, args.keep_legacy, args.dry_run)
+    layout_report = migrate_layout(debates_dir, args.layout, args.dry_run)
+    if (report["converted"] or layout_report["moved"]) and not args.dry_run:
+        refresh_indexes(debates_dir)
+
+    print(format_report(report, args.dry_run), file=sys.stderr)
+    print(format_layout_report(layout_report, args.layout, args.dry_run), file=sys.stderr)
+    return 1 if report["failed"] or layout_report["conflicts"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
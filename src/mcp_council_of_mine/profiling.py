@@ -0,0 +1,180 @@
+import os
+import io
+import re
+import time
+import pstats
+import random
+import logging
+import cProfile
+import threading
+from pathlib import Path
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from mcp_council_of_mine.config import env_flag, env_float
+
+DEFAULT_PROFILE_RATE = 0.1
+REPORT_FILE = "hot_functions.txt"
+MAX_NAME_LENGTH = 64
+
+
+def profile_file_prefix(tool_name: str) -> str:
+    """
+    Filename-safe form of a tool name. The name comes from the client and is
+    not yet checked against the registered tools when the middleware runs.
+    """
+    return re.sub(r"[^A-Za-z0-9_-]", "_", tool_name)[:MAX_NAME_LENGTH] or "tool"
+
+
+class Profiler:
+    """
+    Runs cProfile around a random fraction of tool calls.
+    Each profiled call is written to `<profile_dir>/<tool>_<time>.prof`
+    (loadable with pstats or snakeviz) and merged into an aggregate whose
+    hottest functions are kept in hot_functions.txt.
+
+    cProfile sees everything running on the event loop while the call is in
+    flight, including concurrent work, and only one call is profiled at a
+    time; others run unprofiled.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = DEFAULT_PROFILE_RATE, profile_dir: str | None = None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.profile_dir = profile_dir
+        self.profiled_calls = 0
+        self.aggregate: pstats.Stats | None = None
+        self._active = False
+        self._lock = threading.Lock()
+
+    def _directory(self) -> Path:
+        if self.profile_dir:
+            return Path(self.profile_dir)
+
+        from mcp_council_of_mine.council.state import get_state_manager
+        return get_state_manager().debates_dir.parent / "profiles"
+
+    def should_profile(self) -> bool:
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+
+        with self._lock:
+            if self._active:
+                return False
+            self._active = True
+            return True
+
+    def start(self) -> cProfile.Profile | None:
+        """Start profiling this call if it is sampled; returns the running profile"""
+        if not self.should_profile():
+            return None
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger) already owns the hook
+            logging.warning(f"Could not start profiler: {e}")
+            self._active = False
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, tool_name: str) -> str | None:
+        """Stop a profile, save it and fold it into the aggregate report"""
+        profile.disable()
+        self._active = False
+
+        directory = self._directory()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{profile_file_prefix(tool_name)}_{time.strftime('%Y%m%d_%H%M%S')}_{self.profiled_calls:04d}.prof"
+            profile.dump_stats(str(path))
+
+            with self._lock:
+                self.profiled_calls += 1
+                if self.aggregate is None:
+                    self.aggregate = pstats.Stats(profile)
+                else:
+                    self.aggregate.add(profile)
+
+            (directory / REPORT_FILE).write_text(self.report_text())
+        except OSError as e:
+            logging.warning(f"Failed to write profile for {tool_name}: {e}")
+            return None
+
+        return str(path)
+
+    def hot_functions(self, limit: int = 20, sort: str = "tottime") -> list[dict]:
+        """Aggregated hottest functions across all profiled calls"""
+        if self.aggregate is None:
+            return []
+
+        index = {"tottime": 2, "cumtime": 3, "calls": 1}.get(sort, 2)
+        rows = sorted(self.aggregate.stats.items(), key=lambda item: item[1][index], reverse=True)
+
+        return [
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6)
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows[:limit]
+        ]
+
+    def report_text(self, limit: int = 40) -> str:
+        if self.aggregate is None:
+            return "No profiled calls yet\n"
+
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.add(self.aggregate)
+        stats.sort_stats("tottime").print_stats(limit)
+        return f"Profiled tool calls: {self.profiled_calls}\n" + stream.getvalue()
+
+    def configure(self, enabled: bool, sample_rate: float | None = None):
+        self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "profiled_calls": self.profiled_calls,
+            "profile_dir": str(self._directory())
+        }
+
+
+_profiler: Profiler | None = None
+
+
+def get_profiler() -> Profiler:
+    """
+    Shared profiler configured via COUNCIL_PROFILE=1, COUNCIL_PROFILE_RATE
+    (fraction of tool calls, default 0.1) and COUNCIL_PROFILE_DIR
+    (default: profiles/ next to the debates directory).
+    """
+    global _profiler
+
+    if _profiler is None:
+        _profiler = Profiler(
+            enabled=env_flag("COUNCIL_PROFILE"),
+            sample_rate=env_float("COUNCIL_PROFILE_RATE", DEFAULT_PROFILE_RATE),
+            profile_dir=os.environ.get("COUNCIL_PROFILE_DIR") or None
+        )
+
+    return _profiler
+
+
+class ProfilingMiddleware(Middleware):
+    """Profiles a sampled fraction of tool calls when profiling is enabled"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        profiler = get_profiler()
+        profile = profiler.start()
+        if profile is None:
+            return await call_next(context)
+
+        try:
+            return await call_next(context)
+        finally:
+            profiler.finish(profile, context.message.name)
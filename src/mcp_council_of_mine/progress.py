@@ -0,0 +1,63 @@
+import logging
+from fastmcp import Context
+
+PARTIAL_RESULT_LOGGER = "council_of_mine.partial"
+
+
+class ProgressReporter:
+    """
+    Reports progress for one tool call over MCP progress notifications.
+    A tool call can span several phases (e.g. voting then synthesis), so
+    progress is counted across the whole call and only ever moves forward;
+    the message carries the per-phase count, e.g. "voting: 4/9".
+    Partial results (each opinion or ballot as it arrives) are pushed as
+    structured log notifications from the council_of_mine.partial logger.
+    Notification failures are logged and never interrupt the debate.
+    """
+
+    def __init__(self, ctx: Context, total: int, debate_id: str | None = None):
+        self.ctx = ctx
+        self.total = total
+        self.debate_id = debate_id
+        self.completed = 0
+        self.phase = None
+        self.phase_total = 0
+        self.phase_completed = 0
+
+    async def start_phase(self, phase: str, total: int):
+        """Begin a phase with `total` units of work and report it"""
+        self.phase = phase
+        self.phase_total = total
+        self.phase_completed = 0
+        await self._report()
+
+    async def advance(self, partial: dict | None = None):
+        """Mark one unit of the current phase done, optionally pushing its result"""
+        self.completed = min(self.completed + 1, self.total)
+        self.phase_completed = min(self.phase_completed + 1, self.phase_total)
+        await self._report()
+
+        if partial is not None:
+            await self.push_partial(partial)
+
+    async def push_partial(self, partial: dict):
+        """Send a structured partial result to the client"""
+        try:
+            await self.ctx.log(
+                f"{self.phase} partial result: {partial.get('type', 'update')}",
+                level="info",
+                logger_name=PARTIAL_RESULT_LOGGER,
+                extra={"phase": self.phase, "debate_id": self.debate_id, **partial}
+            )
+        except Exception as e:
+            logging.warning(f"Failed to push partial result: {e}")
+
+    async def _report(self):
+        try:
+            await self.ctx.report_progress(
+                progress=self.completed,
+                total=self.total,
+                message=f"{self.phase}: {self.phase_completed}/{self.phase_total}"
+            )
+        except Exception as e:
+            logging.warning(f"Failed to report progress: {e}")
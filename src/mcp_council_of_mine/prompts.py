@@ -54,7 +54,7 @@ Return the synthesis and winning opinion."""
 @mcp.prompt()
 def quick_poll(statement: str) -> str:
     """
-    Quick council poll: get diverse perspectives on a statement.
+    Quick council poll: see where each member stands on a statement.
 
     Args:
         statement: A statement to evaluate
@@ -63,10 +63,11 @@ def quick_poll(statement: str) -> str:
 
 "{statement}"
 
-Run through the complete debate process and show me:
-- All 9 member opinions
-- Voting results
-- Final synthesis"""
+Call quick_poll with the statement and show me:
+- The agree/disagree/neutral tally
+- Each member's stance and one-line reason
+
+No full debate is needed unless I ask for one."""
 
 
 @mcp.prompt()
@@ -105,5 +106,6 @@ Or use prompts like:
 - "council_debate" - Start a formal debate
 - "ask_council" - Ask a question
 - "council_decision" - Get a decision on a scenario
+- "quick_poll" - Quick agree/disagree/neutral check without a full debate
 - "council_wisdom" - View past debates"""
 
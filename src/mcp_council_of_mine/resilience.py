@@ -0,0 +1,240 @@
+import time
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, TypeVar
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND
+from mcp_council_of_mine.config import env_int, env_float
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 8.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_SECONDS = 30.0
+DEFAULT_PHASE_RETRY_BUDGET = 9
+DEFAULT_PHASE_DEADLINE_SECONDS = 240.0
+MAX_TRACKED_SESSIONS = 1024
+
+PERMANENT_MCP_ERROR_CODES = {METHOD_NOT_FOUND, INVALID_PARAMS, INVALID_REQUEST}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sampling while the circuit breaker is open"""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a sampling failure is worth retrying"""
+    if isinstance(error, McpError):
+        return error.error.code not in PERMANENT_MCP_ERROR_CODES
+
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError, OSError))
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given (1-based) retry attempt"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Fails sampling calls fast while the client looks unhealthy.
+    After failure_threshold consecutive transient failures the breaker opens; once
+    reset_seconds have passed a single trial call is let through, and its
+    outcome either closes the breaker or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        reset_seconds: float = DEFAULT_BREAKER_RESET_SECONDS
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_call(self):
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.rejected += 1
+                raise CircuitOpenError("Sampling circuit is open; client appears unhealthy")
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError("Sampling circuit is half-open; trial call in progress")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def release(self):
+        """Forget an in-flight trial call that was cancelled before it finished"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logging.warning(f"Sampling circuit opened after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected
+        }
+
+
+class RetryBudget:
+    """
+    Retries shared by every sampling call in one debate phase.
+    A retry is only granted while retries remain and its backoff would
+    still finish before the phase deadline.
+    """
+
+    def __init__(self, max_retries: int, deadline_seconds: float, phase: str | None = None):
+        self.phase = phase
+        self.max_retries = max_retries
+        self.deadline = time.monotonic() + deadline_seconds
+        self.retries_used = 0
+
+    def consume(self, delay: float) -> bool:
+        if self.retries_used >= self.max_retries:
+            return False
+
+        if time.monotonic() + delay >= self.deadline:
+            return False
+
+        self.retries_used += 1
+        return True
+
+
+_current_budget: ContextVar[RetryBudget | None] = ContextVar("council_retry_budget", default=None)
+
+
+@contextmanager
+def retry_phase(name: str) -> Iterator[RetryBudget]:
+    """
+    Share one retry budget across all sampling calls made inside the block,
+    including calls in tasks created within it. Configured via
+    COUNCIL_PHASE_RETRY_BUDGET and COUNCIL_PHASE_DEADLINE (seconds).
+    """
+    budget = RetryBudget(
+        max_retries=env_int("COUNCIL_PHASE_RETRY_BUDGET", DEFAULT_PHASE_RETRY_BUDGET),
+        deadline_seconds=env_float("COUNCIL_PHASE_DEADLINE", DEFAULT_PHASE_DEADLINE_SECONDS),
+        phase=name
+    )
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        if budget.retries_used:
+            logging.info(f"{name} phase used {budget.retries_used}/{budget.max_retries} retries")
+        _current_budget.reset(token)
+
+
+def get_current_budget() -> RetryBudget | None:
+    return _current_budget.get()
+
+
+def get_current_phase() -> str:
+    """Name of the enclosing retry_phase, used to label metrics"""
+    budget = _current_budget.get()
+    return budget.phase if budget and budget.phase else "other"
+
+
+_circuit_breakers: OrderedDict[str | None, CircuitBreaker] = OrderedDict()
+
+
+def get_circuit_breaker(session_id: str | None = None) -> CircuitBreaker:
+    """
+    Circuit breaker for one client session, so an unhealthy client only
+    fails fast for itself. Configured via COUNCIL_BREAKER_THRESHOLD and
+    COUNCIL_BREAKER_RESET_SECONDS; the least recently used breakers are
+    forgotten beyond MAX_TRACKED_SESSIONS.
+    """
+    breaker = _circuit_breakers.get(session_id)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            failure_threshold=env_int("COUNCIL_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD),
+            reset_seconds=env_float("COUNCIL_BREAKER_RESET_SECONDS", DEFAULT_BREAKER_RESET_SECONDS)
+        )
+        _circuit_breakers[session_id] = breaker
+        if len(_circuit_breakers) > MAX_TRACKED_SESSIONS:
+            _circuit_breakers.popitem(last=False)
+    else:
+        _circuit_breakers.move_to_end(session_id)
+
+    return breaker
+
+
+async def call_with_retries(
+    factory: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker | None = None,
+    budget: RetryBudget | None = None,
+    max_attempts: int | None = None
+) -> T:
+    """
+    Await factory() with jittered exponential backoff on transient errors.
+    Every attempt is gated by the circuit breaker (the session-less one
+    unless given), and only transient failures count against it. Every retry
+    must be granted by the phase retry budget when one is active.
+    """
+    breaker = breaker or get_circuit_breaker()
+    max_attempts = max_attempts or env_int("COUNCIL_SAMPLE_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    base_delay = env_float("COUNCIL_RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY)
+    max_delay = env_float("COUNCIL_RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY)
+
+    attempt = 0
+    while True:
+        breaker.before_call()
+        attempt += 1
+
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if not is_transient_error(e):
+                # The client answered; a permanent error says nothing about its health
+                breaker.release()
+                raise
+
+            breaker.record_failure()
+            if attempt >= max_attempts:
+                raise
+
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if budget is not None and not budget.consume(delay):
+                logging.warning("Retry budget exhausted for sampling phase")
+                raise
+
+            logging.warning(f"Transient sampling error (attempt {attempt}/{max_attempts}), retrying in {delay:.2f}s: {e}")
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
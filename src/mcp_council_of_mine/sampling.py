@@ -0,0 +1,375 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+from fastmcp import Context
+from mcp_council_of_mine.cache import get_sampling_cache
+from mcp_council_of_mine.config import env_int, env_float, env_flag
+from mcp_council_of_mine.resilience import call_with_retries, get_circuit_breaker, get_current_budget, get_current_phase
+from mcp_council_of_mine.metrics import SIZE_BUCKETS, get_metrics
+from mcp_council_of_mine.tracing import annotate, span
+from mcp_council_of_mine.security import safe_extract_text
+from mcp_council_of_mine.fake_sampling import FakeSamplingBackend
+from mcp_council_of_mine.council.state import get_session_id
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENT_SAMPLES = 9
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_MAX_RATE = 0.1
+DEFAULT_HEDGE_MIN_DELAY = 1.0
+HEDGE_LATENCY_WINDOW = 200
+HEDGE_MIN_OBSERVATIONS = 9
+
+# Section headers in batched responses, e.g. "MEMBER 3:", "**Member 3**" or "=== Member 3 ==="
+MEMBER_SECTION = re.compile(r'(?im)^[\s#*=]*member\s+(\d+)\b[^\n]*$')
+
+
+def get_max_concurrent_samples() -> int:
+    """
+    Maximum number of sampling calls allowed in flight at once.
+    Configured via COUNCIL_MAX_CONCURRENT_SAMPLES (default: one per council member).
+    """
+    return max(1, env_int("COUNCIL_MAX_CONCURRENT_SAMPLES", DEFAULT_MAX_CONCURRENT_SAMPLES))
+
+
+async def gather_limited(
+    factories: list[Callable[[], Awaitable[T]]],
+    limit: int | None = None
+) -> list[T | BaseException]:
+    """
+    Run coroutine factories concurrently with at most `limit` running at once.
+    Results are returned in input order. Exceptions are returned in place of
+    results so one failure never cancels the others.
+    """
+    semaphore = asyncio.Semaphore(limit or get_max_concurrent_samples())
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(
+        *(run(factory) for factory in factories),
+        return_exceptions=True
+    )
+
+
+async def gather_until(
+    factories: list[Callable[[], Awaitable[T]]],
+    on_result: Callable[[int, T | BaseException], bool],
+    limit: int | None = None
+) -> dict[int, T | BaseException]:
+    """
+    Like gather_limited, but each result is handed to on_result(index, result)
+    as soon as it completes. Once on_result returns True, calls still running
+    are cancelled and calls waiting for a slot are never started.
+    Returns the completed results keyed by input index.
+    """
+    semaphore = asyncio.Semaphore(limit or get_max_concurrent_samples())
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    tasks = {asyncio.ensure_future(run(factory)): index for index, factory in enumerate(factories)}
+    results: dict[int, T | BaseException] = {}
+    pending = set(tasks)
+    stop = False
+
+    try:
+        while pending and not stop:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Calls finishing together are handled in input order
+            for task in sorted(done, key=tasks.get):
+                index = tasks[task]
+                results[index] = task.exception() or task.result()
+                stop = on_result(index, results[index]) or stop
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return results
+
+
+class HedgePolicy:
+    """
+    Decides when a slow sampling call gets a duplicate ("hedge") request.
+    A hedge is issued once a call has run longer than the configured
+    percentile of recent latencies, as long as hedges stay below
+    max_hedge_rate of all calls.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        max_hedge_rate: float = DEFAULT_HEDGE_MAX_RATE,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        window: int = HEDGE_LATENCY_WINDOW,
+        min_observations: int = HEDGE_MIN_OBSERVATIONS
+    ):
+        self.enabled = enabled
+        self.percentile = min(max(percentile, 0.0), 1.0)
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.min_observations = min_observations
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_latency(self, seconds: float):
+        self.latencies.append(seconds)
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None if there is not enough history yet"""
+        if len(self.latencies) < self.min_observations:
+            return None
+
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def try_hedge(self) -> bool:
+        """Reserve a hedge if doing so keeps the hedge rate under the cap"""
+        if (self.hedges + 1) > self.max_hedge_rate * max(self.calls, 1):
+            return False
+
+        self.hedges += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": self.hedge_delay()
+        }
+
+
+_hedge_policy: HedgePolicy | None = None
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """
+    Shared hedging policy configured from the environment:
+    COUNCIL_HEDGE_SAMPLES=1 to enable, COUNCIL_HEDGE_PERCENTILE (default 0.95),
+    COUNCIL_HEDGE_MAX_RATE (default 0.1) and COUNCIL_HEDGE_MIN_DELAY seconds.
+    """
+    global _hedge_policy
+
+    if _hedge_policy is None:
+        _hedge_policy = HedgePolicy(
+            enabled=env_flag("COUNCIL_HEDGE_SAMPLES"),
+            percentile=env_float("COUNCIL_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE),
+            max_hedge_rate=env_float("COUNCIL_HEDGE_MAX_RATE", DEFAULT_HEDGE_MAX_RATE),
+            min_delay=env_float("COUNCIL_HEDGE_MIN_DELAY", DEFAULT_HEDGE_MIN_DELAY)
+        )
+
+    return _hedge_policy
+
+
+async def hedged_call(factory: Callable[[], Awaitable[T]], policy: HedgePolicy) -> T:
+    """
+    Await factory(), issuing one duplicate call if the first is slower than
+    the policy's hedge delay. The first successful result wins and the other
+    call is cancelled; if both fail, the last error is raised.
+    """
+    policy.calls += 1
+    started = time.monotonic()
+    primary = asyncio.ensure_future(factory())
+    tasks = {primary}
+
+    try:
+        delay = policy.hedge_delay() if policy.enabled else None
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.try_hedge():
+                logging.info(f"Hedging sampling call after {delay:.2f}s")
+                tasks.add(asyncio.ensure_future(factory()))
+
+        error: BaseException | None = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        policy.hedge_wins += 1
+                    policy.record_latency(time.monotonic() - started)
+                    return task.result()
+                error = task.exception()
+
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def measure_prefix_overlap(prompts: list[str]) -> dict:
+    """
+    Measure how much of a batch of prompts is a common prefix, which is what
+    provider-side prompt caching can reuse across the batch.
+    """
+    if not prompts:
+        return {"prompts": 0, "shared_prefix_chars": 0, "average_chars": 0, "overlap_ratio": 0.0}
+
+    shared = len(os.path.commonprefix(prompts))
+    average = sum(len(prompt) for prompt in prompts) / len(prompts)
+
+    return {
+        "prompts": len(prompts),
+        "shared_prefix_chars": shared,
+        "average_chars": round(average),
+        "overlap_ratio": round(shared / average, 3) if average else 0.0
+    }
+
+
+def format_member_blocks(members: list[dict], with_personality: bool = True) -> str:
+    """Describe each member for a single prompt that covers the whole council"""
+    blocks = []
+    for member in members:
+        block = f"Member {member['id']}: {member['name']} (the {member['archetype']})"
+        if with_personality:
+            # First paragraph only; the shared formatting note is repeated per member
+            block += "\n" + member['personality'].split("\n\n")[0]
+        blocks.append(block)
+
+    return ("\n\n" if with_personality else "\n").join(blocks)
+
+
+def split_member_sections(response_text: str) -> list[tuple[int, str]]:
+    """(member number, section text) for every member section of a batched response, in order"""
+    sections = MEMBER_SECTION.split(response_text)
+    return [(int(sections[idx]), sections[idx + 1]) for idx in range(1, len(sections) - 1, 2)]
+
+
+_sampling_backend: FakeSamplingBackend | None = None
+
+
+def get_sampling_backend() -> FakeSamplingBackend | None:
+    """
+    Backend that replaces client sampling, or None to sample from the client.
+    COUNCIL_SAMPLING_BACKEND=fake runs the server against the deterministic
+    FakeSamplingBackend (configured via COUNCIL_FAKE_*), e.g. for offline
+    benchmarks or clients without sampling support.
+    """
+    global _sampling_backend
+
+    if _sampling_backend is None and os.environ.get("COUNCIL_SAMPLING_BACKEND", "").strip().lower() == "fake":
+        _sampling_backend = FakeSamplingBackend.from_env()
+
+    return _sampling_backend
+
+
+def set_sampling_backend(backend: FakeSamplingBackend | None):
+    """Install (or with None, remove) a sampling backend for all tools"""
+    global _sampling_backend
+    _sampling_backend = backend
+
+
+def extract_text_from_response(response) -> str:
+    """Extract text from any sampling response format"""
+    try:
+        if isinstance(getattr(response, 'text', None), str):
+            return response.text
+
+        if hasattr(response, 'content') and response.content:
+            content_item = response.content[0]
+
+            if hasattr(content_item, 'text'):
+                return str(content_item.text)
+
+            if isinstance(content_item, dict) and 'text' in content_item:
+                return str(content_item['text'])
+
+            content_str = safe_extract_text(str(content_item))
+
+            match = re.search(r"text='(.+?)'(?:\s+annotations=|\s+meta=|$)", content_str, re.DOTALL)
+            if not match:
+                match = re.search(r'text="(.+?)"(?:\s+annotations=|\s+meta=|$)', content_str, re.DOTALL)
+            if match:
+                text = match.group(1)
+                text = text.replace('\\n', '\n').replace("\\'", "'").replace('\\"', '"')
+                return text
+
+        return str(response)
+    except (AttributeError, KeyError, IndexError, TypeError) as e:
+        logging.warning(f"Failed to extract text from response: {e}")
+        return ""
+
+
+async def sample_text(
+    ctx: Context,
+    prompt: str,
+    *,
+    temperature: float,
+    max_tokens: int,
+    member_id: int | None = None,
+    system_prompt: str | None = None,
+    use_cache: bool = True,
+    hedge: bool = False
+) -> str:
+    """
+    Sample from the client (or the configured sampling backend) and return
+    the response text. Every sampling call in tools/ goes through here. Non-empty responses are
+    cached by member, normalized prompt, temperature and max_tokens; pass
+    use_cache=False to always hit the client. With hedge=True the call may be
+    duplicated when it straggles (see HedgePolicy). Transient errors are retried
+    with backoff under the session's circuit breaker and the active retry_phase budget;
+    remaining exceptions propagate to the caller.
+    """
+    cache = get_sampling_cache()
+    key = cache.make_key(member_id, prompt, temperature, max_tokens, system_prompt)
+    metrics = get_metrics()
+    phase = get_current_phase()
+
+    with span("sample", member_id=member_id, phase=phase):
+        if use_cache:
+            cached = await cache.aget(key)
+            if cached is not None:
+                metrics.inc("council_sampling_cache_hits_total", phase=phase)
+                annotate(cache_hit=True)
+                return cached
+
+        kwargs = {"temperature": temperature, "max_tokens": max_tokens}
+        if system_prompt:
+            kwargs["system_prompt"] = system_prompt
+
+        backend = get_sampling_backend()
+        sample = backend.sample if backend else ctx.sample
+
+        async def attempt():
+            if hedge:
+                return await hedged_call(lambda: sample(prompt, **kwargs), get_hedge_policy())
+            return await sample(prompt, **kwargs)
+
+        prompt_chars = len(prompt) + len(system_prompt or "")
+        metrics.inc("council_sampling_calls_total", phase=phase)
+        metrics.observe("council_prompt_chars", prompt_chars, SIZE_BUCKETS, phase=phase)
+        started = time.perf_counter()
+
+        try:
+            response = await call_with_retries(
+                attempt,
+                breaker=get_circuit_breaker(get_session_id(ctx)),
+                budget=get_current_budget()
+            )
+        except Exception:
+            metrics.inc("council_sampling_failures_total", phase=phase)
+            raise
+
+        metrics.observe("council_sampling_latency_seconds", time.perf_counter() - started, phase=phase)
+        text = extract_text_from_response(response)
+        metrics.observe("council_response_chars", len(text), SIZE_BUCKETS, phase=phase)
+
+        annotate(prompt_chars=prompt_chars, response_chars=len(text))
+
+        if use_cache and text.strip():
+            await cache.aset(key, text)
+
+        return text
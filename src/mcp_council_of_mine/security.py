@@ -15,12 +15,13 @@ MAX_REASONING_LENGTH = 1000
 def validate_debate_id(debate_id: str) -> bool:
     """
     Validate debate_id format to prevent path traversal.
-    Expected format: YYYYMMDD_HHMMSS
+    Expected format: YYYYMMDD_HHMMSS, with a _N suffix for debates
+    started within the same second
     """
     if not isinstance(debate_id, str):
         return False
 
-    if not re.match(r'^\d{8}_\d{6}$', debate_id):
+    if not re.match(r'^\d{8}_\d{6}(_\d{1,4})?$', debate_id):
         logging.warning(f"Invalid debate_id format attempted: {debate_id}")
         return False
 
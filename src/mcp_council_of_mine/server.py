@@ -1,4 +1,6 @@
 from fastmcp import FastMCP
+from mcp_council_of_mine.tracing import TracingMiddleware
+from mcp_council_of_mine.profiling import ProfilingMiddleware
 
 INSTRUCTIONS = """
 Council of Mine is an MCP server that simulates a democratic council of 9 AI-powered members with distinct personalities who debate topics and vote on the best perspectives.
@@ -36,12 +38,19 @@ Use Council of Mine when you need:
    - All 9 members each generate an opinion via LLM sampling
    - Returns formatted text showing ALL individual opinions with member names and perspectives
    - Each member's unique viewpoint is preserved and displayed separately
+   - Optional batched=True asks for all opinions in a single sampling call (fewer LLM calls)
 
 2. **conduct_voting()** - Members vote on opinions (must run after start_council_debate)
    - Each member votes for opinions aligning with their values
    - Members cannot vote for their own opinion
    - Returns detailed vote information including who voted for whom with reasoning
    - Agents can see individual voting decisions and rationale
+   - Optional batched=True collects all ballots in a single sampling call
+   - Optional compress_opinions=True shows voters short digests of each opinion
+   - Optional sample_size=k has each voter review only k opinions (for large councils);
+     results are then ranked by vote rate per ballot shown, with confidence estimates
+   - Optional decisive=True stops collecting ballots once the winner can no longer change;
+     members who did not vote are listed with the reason
 
 3. **get_results()** - Generates final results (must run after conduct_voting)
    - **Shows ALL 9 individual opinions** from each council member with vote counts
@@ -51,12 +60,27 @@ Use Council of Mine when you need:
    - AI-synthesized summary incorporating all perspectives
    - Saves debate to history
 
+### Quick Poll
+- **quick_poll(statement)** - Fast sentiment check without a full debate
+  - Each member answers agree/disagree/neutral with a one-line reason
+  - Returns a tally; no voting, synthesis, or history entry
+  - Optional batched=True asks for every stance in a single sampling call
+
 ### History & Status Tools
-- **list_past_debates()** - View all historical debates with metadata
+- **list_past_debates(limit?, cursor?, since?, until?, has_results?)** - Page through historical debates (newest first) with metadata; pass next_cursor to continue
 - **view_debate(debate_id)** - Retrieve complete data for a specific past debate
   - Includes all opinions, individual votes, and results
   - Full vote breakdown showing each member's vote and reasoning
-- **get_current_debate_status()** - Check the status of the current active debate
+- **search_debates(query)** - Ranked full-text search over past prompts, opinions, vote reasoning and syntheses, with snippets
+- **get_current_debate_status(debate_id?)** - Check the status of an active debate and list your active debate IDs
+
+### Diagnostics Tools
+- **get_sampling_cache_stats()** - Hit/miss counters for the sampling response cache
+  - Debate tools accept use_cache=False to bypass cached responses for a call
+- **get_council_metrics(format="json")** - Sampling latency, failures, invalid ballots and
+  storage timings per phase; format="prometheus" returns Prometheus text format
+- **set_profiling(enabled, sample_rate)** / **get_profiling_report()** - Profile a fraction
+  of tool calls with cProfile and list the hottest functions
 
 ## Typical Usage Pattern
 
@@ -66,14 +90,16 @@ For a new debate:
 3. Call get_results()
 
 To reference past debates:
-1. Call list_past_debates() to see available debates
+1. Call list_past_debates() to see available debates, or search_debates("topic words") to find relevant ones
 2. Call view_debate(debate_id) to see specific debate details
 
 ## Important Notes
-- Only one debate can be active at a time
-- Must complete the full workflow (start → vote → results) before starting a new debate
+- Several debates can be active at once; conduct_voting, get_results and get_current_debate_status act on your latest debate unless given a debate_id
+- Each debate must complete the full workflow (start → vote → results) to be saved
 - Each complete debate makes ~28 LLM calls (9 opinions + 9 votes + 9 reasoning + 1 synthesis)
 - All debates are automatically saved to history when get_results() is called
+- Debate tools report progress per phase (e.g. "voting: 4/9") and push each opinion
+  and ballot as a structured log message (logger "council_of_mine.partial") as it arrives
 - **Full voting transparency**: All individual votes and reasoning are visible to agents
   - See exactly which members voted for which opinions
   - Access each member's reasoning for their vote choice
@@ -82,13 +108,20 @@ To reference past debates:
 """
 
 mcp = FastMCP(name="council-of-mine", instructions=INSTRUCTIONS)
+mcp.add_middleware(TracingMiddleware())
+mcp.add_middleware(ProfilingMiddleware())
 
 from mcp_council_of_mine import tools  # noqa: F401, E402
 from mcp_council_of_mine import prompts  # noqa: F401, E402
 
 
 def main():
-    mcp.run()
+    try:
+        mcp.run()
+    finally:
+        # Debates are written behind; make sure the last ones reach the disk
+        from mcp_council_of_mine.council.state import get_state_manager
+        get_state_manager().close()
 
 if __name__ == "__main__":
     main()
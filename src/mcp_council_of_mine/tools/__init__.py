@@ -1,3 +1,3 @@
-from mcp_council_of_mine.tools import debate, voting, results, history
+from mcp_council_of_mine.tools import debate, voting, results, history, poll, diagnostics
 
-__all__ = ['debate', 'voting', 'results', 'history']
+__all__ = ['debate', 'voting', 'results', 'history', 'poll', 'diagnostics']
@@ -0,0 +1,83 @@
+from mcp_council_of_mine.server import mcp
+from mcp_council_of_mine.cache import get_sampling_cache
+from mcp_council_of_mine.metrics import get_metrics
+from mcp_council_of_mine.profiling import get_profiler
+
+
+@mcp.tool()
+def get_sampling_cache_stats() -> dict:
+    """
+    Get hit/miss counters for the sampling response cache.
+
+    Returns:
+        Cache hits, misses, disk hits, evictions, hit rate and entry counts
+    """
+    return get_sampling_cache().stats()
+
+
+@mcp.tool()
+def get_council_metrics(format: str = "json") -> dict | str:
+    """
+    Get counters and histograms for council activity since the server started:
+    sampling calls, failures, cache hits, latency and prompt/response sizes per
+    phase (opinions, voting, synthesis, poll), invalid ballots, and debate
+    save/load and list_debates scan durations.
+
+    Args:
+        format: "json" for a structured snapshot or "prometheus" for the
+            Prometheus text exposition format
+
+    Returns:
+        Metrics snapshot, or Prometheus text when format="prometheus"
+    """
+    metrics = get_metrics()
+
+    if format == "prometheus":
+        return metrics.to_prometheus()
+
+    if format != "json":
+        return {"error": "format must be 'json' or 'prometheus'"}
+
+    return metrics.snapshot()
+
+
+@mcp.tool()
+def set_profiling(enabled: bool, sample_rate: float | None = None) -> dict:
+    """
+    Turn tool-call profiling on or off without restarting the server.
+    Profiled calls are saved as .prof files and summarized in hot_functions.txt
+    in the profiles directory.
+
+    Args:
+        enabled: Whether to profile tool calls
+        sample_rate: Fraction of tool calls to profile (0-1, default 0.1 or
+            COUNCIL_PROFILE_RATE)
+
+    Returns:
+        Current profiling settings
+    """
+    profiler = get_profiler()
+    profiler.configure(enabled, sample_rate)
+    return profiler.stats()
+
+
+@mcp.tool()
+def get_profiling_report(limit: int = 20, sort: str = "tottime") -> dict:
+    """
+    Get the hottest functions across all profiled tool calls.
+
+    Args:
+        limit: Number of functions to return
+        sort: "tottime" (time in the function itself), "cumtime" or "calls"
+
+    Returns:
+        Profiling settings and the aggregated hot-function list
+    """
+    if sort not in ("tottime", "cumtime", "calls"):
+        return {"error": "sort must be 'tottime', 'cumtime' or 'calls'"}
+
+    profiler = get_profiler()
+    return {
+        **profiler.stats(),
+        "hot_functions": profiler.hot_functions(limit=max(1, limit), sort=sort)
+    }
@@ -1,24 +1,86 @@
+import asyncio
 import logging
 from mcp_council_of_mine.server import mcp
-from mcp_council_of_mine.council.state import get_state_manager
+from mcp_council_of_mine.council.state import get_session_id, get_state_manager
+from mcp_council_of_mine.council.index import encode_cursor
 from fastmcp import Context
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_SEARCH_RESULTS = 50
+MAX_SEARCH_QUERY_LENGTH = 500
+
 
 @mcp.tool()
-def list_past_debates() -> dict:
+def list_past_debates(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    has_results: bool | None = None
+) -> dict:
     """
-    List all past debates stored in the debates directory.
+    List past debates stored in the debates directory, newest first, one page at a time.
     Shows debate ID, prompt, timestamp, and whether results are available.
 
+    Args:
+        limit: Debates per page (1-100, default 20)
+        cursor: next_cursor from the previous page, to continue listing
+        since: Only debates on or after this date (YYYY-MM-DD or ISO datetime)
+        until: Only debates on or before this date (YYYY-MM-DD or ISO datetime)
+        has_results: Only debates with (true) or without (false) saved results
+
     Returns:
-        Dictionary with list of past debates
+        Dictionary with the page of debates, total_debates in history, and
+        next_cursor (null on the last page)
     """
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
     state = get_state_manager()
-    debates = state.list_debates()
+
+    try:
+        # One extra debate tells us whether another page follows
+        debates = state.list_debates(limit + 1, cursor, since, until, has_results)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    next_cursor = None
+    if len(debates) > limit:
+        debates = debates[:limit]
+        next_cursor = encode_cursor(debates[-1]["debate_id"])
 
     return {
-        "total_debates": len(debates),
-        "debates": debates
+        "total_debates": state.count_debates(),
+        "debates": debates,
+        "next_cursor": next_cursor
+    }
+
+
+@mcp.tool()
+async def search_debates(query: str, limit: int = 10) -> dict:
+    """
+    Full-text search across past debates: prompts, opinions, vote reasoning
+    and syntheses. Results are ranked by relevance (BM25), with the topic
+    counting most, and each comes with a snippet around the match.
+
+    Args:
+        query: Words to search for
+        limit: Maximum number of results (1-50, default 10)
+
+    Returns:
+        Dictionary with total_matches and ranked results (debate_id, prompt,
+        timestamp, score, matched_in, snippet); use view_debate(debate_id) for details
+    """
+    if not query.strip() or len(query) > MAX_SEARCH_QUERY_LENGTH:
+        return {"error": f"Query must be 1-{MAX_SEARCH_QUERY_LENGTH} characters"}
+
+    limit = min(max(limit, 1), MAX_SEARCH_RESULTS)
+    # Search waits for queued debate writes; keep that off the event loop
+    results, total_matches = await asyncio.to_thread(get_state_manager().search_debates, query, limit)
+
+    return {
+        "query": query,
+        "total_matches": total_matches,
+        "results": results
     }
 
 
@@ -58,18 +120,28 @@ def view_debate(debate_id: str, ctx: Context = None) -> dict:
 
 
 @mcp.tool()
-def get_current_debate_status() -> dict:
+def get_current_debate_status(debate_id: str | None = None, ctx: Context = None) -> dict:
     """
-    Get the status of the current active debate (if any).
+    Get the status of an active debate (by default this client's latest one).
+
+    Args:
+        debate_id: Active debate to inspect
 
     Returns:
-        Current debate information or message if no active debate
+        Debate information plus the IDs of this client's active debates, or
+        a message if there is no matching active debate
     """
     state = get_state_manager()
-    current = state.get_current_debate()
+    session_id = get_session_id(ctx)
+    current = state.get_current_debate(debate_id, session_id)
+    active_debates = state.list_active_debates(session_id)
 
     if not current:
-        return {"status": "no_active_debate", "message": "No debate currently in progress"}
+        return {
+            "status": "no_active_debate",
+            "message": "No debate currently in progress",
+            "active_debates": active_debates
+        }
 
     return {
         "status": "active",
@@ -77,5 +149,6 @@ def get_current_debate_status() -> dict:
         "prompt": current["prompt"],
         "opinions_count": len(current["opinions"]),
         "votes_count": len(current["votes"]),
-        "has_results": current["results"] is not None
+        "has_results": current["results"] is not None,
+        "active_debates": active_debates
     }
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import logging
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+SERVICE_NAME = "council-of-mine"
+INSTRUMENTATION_SCOPE = "mcp_council_of_mine"
+
+# Attributes copied from a parent span to its children so every span of a
+# debate can be found by debate_id
+INHERITED_ATTRIBUTES = ("debate_id",)
+
+
+class Span:
+    """One timed operation, serialized in the OTLP JSON span shape"""
+
+    def __init__(self, name: str, trace_id: str, parent: "Span | None", attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes = {
+            key: parent.attributes[key]
+            for key in INHERITED_ATTRIBUTES
+            if parent and key in parent.attributes
+        }
+        self.attributes.update(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attributes(self, **attributes):
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_current_span: ContextVar[Span | None] = ContextVar("council_current_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans and appends each finished span to a JSONL file, one OTLP
+    ExportTraceServiceRequest per line (the format the OpenTelemetry
+    Collector's file exporter writes and its otlpjsonfile receiver reads).
+    With no trace file the tracer is disabled and span() costs next to nothing.
+    """
+
+    def __init__(self, trace_file: str | None = None):
+        self.trace_file = trace_file
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.trace_file)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span | None]:
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        span = Span(name, trace_id, parent, {k: v for k, v in attributes.items() if v is not None})
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.export(span)
+
+    def export(self, span: Span):
+        record = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": INSTRUMENTATION_SCOPE}, "spans": [span.to_otlp()]}]
+            }]
+        }
+        line = json.dumps(record) + "\n"
+
+        try:
+            with self._lock, open(self.trace_file, "a") as f:
+                f.write(line)
+        except OSError as e:
+            logging.warning(f"Failed to export span {span.name}: {e}")
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """Shared tracer; set COUNCIL_TRACE_FILE to a .jsonl path to enable tracing"""
+    global _tracer
+
+    if _tracer is None:
+        _tracer = Tracer(os.environ.get("COUNCIL_TRACE_FILE") or None)
+
+    return _tracer
+
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the current span (or a new trace)"""
+    return get_tracer().span(name, **attributes)
+
+
+def annotate(**attributes):
+    """Add attributes to the current span, e.g. a debate_id known only mid-call"""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attributes(**attributes)
+
+
+class TracingMiddleware(Middleware):
+    """Opens the root span for every tool call"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        with span(f"tool/{context.message.name}", **{"tool.name": context.message.name}):
+            return await call_next(context)
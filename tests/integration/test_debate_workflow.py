@@ -0,0 +1,139 @@
+"""
+End-to-end debate workflow tests against the fake sampling backend
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+
+import pytest
+
+from mcp_council_of_mine import resilience, sampling, tracing
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.fake_sampling import FakeContext, FakeSamplingBackend, LatencyModel
+from mcp_council_of_mine.tools.debate import start_council_debate
+from mcp_council_of_mine.tools.results import get_results
+from mcp_council_of_mine.tools.voting import conduct_voting
+
+
+@pytest.fixture
+def council(tmp_path, monkeypatch):
+    """Fresh debate storage and a breaker that tolerates injected failures"""
+    monkeypatch.setattr(state_module, "_state_manager", StateManager(debates_dir=str(tmp_path)))
+    monkeypatch.setattr(resilience, "_circuit_breakers", OrderedDict())
+    monkeypatch.setenv("COUNCIL_BREAKER_THRESHOLD", "1000")
+    monkeypatch.setenv("COUNCIL_RETRY_BASE_DELAY", "0.001")
+    return state_module.get_state_manager()
+
+
+async def run_debate(ctx: FakeContext, topic: str) -> tuple[dict, str]:
+    await start_council_debate.fn(topic, ctx, use_cache=False)
+    voting = await conduct_voting.fn(ctx, use_cache=False)
+    results = await get_results.fn(ctx, use_cache=False)
+    return voting, results
+
+
+def test_full_debate_runs_offline(council):
+    """start → vote → results completes and saves without a sampling client"""
+    backend = FakeSamplingBackend(seed="offline", latency=LatencyModel(median=0.01, jitter=0.2))
+    ctx = FakeContext(backend)
+
+    voting, results = asyncio.run(run_debate(ctx, "Should we adopt a four-day work week?"))
+
+    assert voting["total_votes"] == 9
+    assert "COUNCIL SYNTHESIS" in results
+    assert backend.calls == {"opinion": 9, "ballot": 9, "synthesis": 1}
+    assert len(council.list_debates()) == 1
+    assert ctx.progress[-1][2] == "synthesis: 1/1"
+
+
+def test_same_seed_gives_same_debate(council):
+    """Votes depend only on the seed and prompts, not on timing"""
+    topic = "Is a monorepo right for us?"
+
+    def votes_for(latency: LatencyModel) -> dict:
+        ctx = FakeContext(FakeSamplingBackend(seed="repeat", latency=latency))
+        voting, _ = asyncio.run(run_debate(ctx, topic))
+        return {vote["voter"]: vote["voted_for"] for vote in voting["individual_votes"]}
+
+    fast = votes_for(LatencyModel(distribution="constant", median=0.0))
+    jittery = votes_for(LatencyModel(distribution="exponential", median=0.005, jitter=0.5))
+    assert fast == jittery
+
+
+def test_failures_and_malformed_ballots_become_abstentions(council):
+    """Injected failures are retried and unusable ballots are recorded, not cast"""
+    backend = FakeSamplingBackend(seed="chaos", failure_rate=0.2, malformed_rate=0.4)
+    ctx = FakeContext(backend)
+
+    voting, _ = asyncio.run(run_debate(ctx, "Should we rewrite the billing service?"))
+
+    assert sum(backend.failures.values()) > 0
+    assert voting["total_votes"] < 9
+    abstainers = {abstention["member_name"] for abstention in voting["abstentions"]}
+    voters = {vote["voter"] for vote in voting["individual_votes"]}
+    assert len(abstainers) + len(voters) == 9
+    assert not abstainers & voters
+
+
+def test_backend_replaces_client_sampling(council):
+    """An installed backend is used even when the context cannot sample"""
+    backend = FakeSamplingBackend(seed="installed")
+    sampling.set_sampling_backend(backend)
+    try:
+        ctx = FakeContext(FakeSamplingBackend(failure_rate=1.0))
+        asyncio.run(start_council_debate.fn("Should we ship on Fridays?", ctx, use_cache=False))
+    finally:
+        sampling.set_sampling_backend(None)
+
+    assert backend.calls["opinion"] == 9
+    opinions = council.get_current_debate()["opinions"].values()
+    assert all(not op["opinion"].startswith("[Error") for op in opinions)
+
+
+def test_debate_spans_are_exported(council, tmp_path, monkeypatch):
+    """Opinion sampling and state spans carry the debate_id under the phase span"""
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer(str(trace_file)))
+
+    ctx = FakeContext(FakeSamplingBackend(seed="traced"))
+    asyncio.run(start_council_debate.fn("Should we adopt tracing?", ctx, use_cache=False))
+
+    spans = [
+        json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        for line in trace_file.read_text().splitlines()
+    ]
+    phase = next(s for s in spans if s["name"] == "phase/opinions")
+    samples = [s for s in spans if s["name"] == "sample"]
+    debate_id = council.get_current_debate()["debate_id"]
+
+    assert len(samples) == 9
+    assert all(s["parentSpanId"] == phase["spanId"] for s in samples)
+    for s in samples:
+        attributes = {a["key"]: a["value"] for a in s["attributes"]}
+        assert attributes["debate_id"] == {"stringValue": debate_id}
+        assert "member_id" in attributes
+    assert sum(s["name"] == "state/add_opinion" for s in spans) == 9
+
+
+def test_concurrent_sessions_run_separate_debates(council):
+    """Debates from different sessions run at once without sharing state"""
+    topics = {
+        "alice": "Should we adopt a four-day work week?",
+        "bob": "Is a monorepo right for us?",
+        "carol": "Should we ship on Fridays?",
+    }
+
+    async def run_all():
+        return await asyncio.gather(*[
+            run_debate(FakeContext(FakeSamplingBackend(seed=session), session_id=session), topic)
+            for session, topic in topics.items()
+        ])
+
+    outcomes = asyncio.run(run_all())
+
+    assert all(voting["total_votes"] == 9 for voting, _ in outcomes)
+    assert len({voting["debate_id"] for voting, _ in outcomes}) == 3
+    assert sorted(d["prompt"] for d in council.list_debates()) == sorted(topics.values())
+    assert council.list_active_debates() == []
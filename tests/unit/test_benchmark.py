@@ -0,0 +1,47 @@
+"""
+Benchmark suite tests for Council of Mine MCP Server
+"""
+
+from mcp_council_of_mine.benchmark import percentile, run_benchmark
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.fake_sampling import LatencyModel
+
+
+def test_percentile_nearest_rank():
+    """Percentiles pick observed values by nearest rank"""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+
+
+def test_benchmark_report_covers_every_phase():
+    """A short run reports per-phase timings and sampling volume without leaking state"""
+    saved = state_module._state_manager
+    report = run_benchmark(runs=2, latency=LatencyModel(distribution="constant", median=0.0))
+
+    assert set(report["phases"]) == {"opinions", "voting", "results", "total"}
+    assert report["phases"]["opinions"]["sampling_calls_per_run"] == 9
+    assert report["phases"]["total"]["sampling_calls_per_run"] == 19
+    assert report["phases"]["voting"]["prompt_chars_per_run"] > report["phases"]["results"]["prompt_chars_per_run"]
+    assert set(report["phases"]["total"]["wall_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+    assert state_module._state_manager is saved
+
+
+def test_benchmark_volume_fields_repeat_for_a_seed():
+    """Everything but the measured timings is identical across runs with the same seed"""
+    latency = LatencyModel(distribution="constant", median=0.0)
+
+    def deterministic_fields(report: dict) -> dict:
+        return {
+            "config": report["config"],
+            "phases": {
+                phase: {key: value for key, value in stats.items() if key not in ("wall_ms", "cpu_ms")}
+                for phase, stats in report["phases"].items()
+            }
+        }
+
+    first = run_benchmark(runs=2, seed="repeat", latency=latency)
+    second = run_benchmark(runs=2, seed="repeat", latency=latency)
+
+    assert deterministic_fields(first) == deterministic_fields(second)
@@ -0,0 +1,86 @@
+"""
+Sampling cache tests for Council of Mine MCP Server
+"""
+
+import time
+import asyncio
+import threading
+
+from mcp_council_of_mine.cache import SamplingCache
+
+
+def test_key_normalizes_whitespace_but_not_parameters():
+    """Whitespace-only prompt differences share a key; parameters do not"""
+    key = SamplingCache.make_key(1, "Should we  ship?\n", 0.8, 200)
+    assert key == SamplingCache.make_key(1, "Should we ship?", 0.8, 200)
+    assert key != SamplingCache.make_key(2, "Should we ship?", 0.8, 200)
+    assert key != SamplingCache.make_key(1, "Should we ship?", 0.7, 200)
+    assert key != SamplingCache.make_key(1, "Should we ship?", 0.8, 150)
+
+
+def test_memory_tier_lru_eviction():
+    """The least recently used entry is evicted first"""
+    cache = SamplingCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.set("c", "3")
+    assert cache.get("b") is None, "b was least recently used"
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses"""
+    cache = SamplingCache(ttl_seconds=0)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Disk entries are served by a fresh cache instance"""
+    SamplingCache(disk_dir=tmp_path).set("abcd", "cached opinion")
+
+    cache = SamplingCache(disk_dir=tmp_path)
+    assert cache.get("abcd") == "cached opinion"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_size_eviction(tmp_path):
+    """Pruning keeps only the newest max_disk_entries files"""
+    cache = SamplingCache(disk_dir=tmp_path, max_disk_entries=2)
+    for key in ("aa01", "aa02", "aa03"):
+        cache.set(key, key)
+        time.sleep(0.01)
+
+    cache.prune_disk()
+    assert sorted(p.stem for p in tmp_path.glob("*/*.json")) == ["aa02", "aa03"]
+
+
+def test_async_access_keeps_disk_io_off_the_event_loop(tmp_path):
+    """aget/aset read, write and prune the disk tier in worker threads"""
+    cache = SamplingCache(disk_dir=tmp_path)
+    disk_threads = []
+
+    for name in ("_get_from_disk", "_write_to_disk", "prune_disk"):
+        original = getattr(cache, name)
+
+        def record(*args, _original=original):
+            disk_threads.append(threading.current_thread())
+            return _original(*args)
+
+        setattr(cache, name, record)
+
+    async def exercise():
+        await cache.aset("abcd", "cached opinion")
+        cache._memory.clear()
+        return await cache.aget("abcd"), await cache.aget("ef01")
+
+    assert asyncio.run(exercise()) == ("cached opinion", None)
+    assert len(disk_threads) == 4, "write, first prune, disk hit, disk miss"
+    assert threading.main_thread() not in disk_threads
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["misses"] == 1
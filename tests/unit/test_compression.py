@@ -0,0 +1,44 @@
+"""
+Opinion compression tests for Council of Mine MCP Server
+"""
+
+from mcp_council_of_mine.compression import digest_opinion, digest_opinions
+
+LONG_OPINION = (
+    "Remote work improves focus for deep engineering work. "
+    "Commute time drops to zero, which many people enjoy. "
+    "However, remote work makes mentoring junior engineers harder without deliberate effort. "
+    "Teams that invest in written communication make remote work succeed. "
+    "Some offices have nice coffee. "
+    "Overall, remote work with strong written communication and intentional mentoring is the best path."
+)
+
+
+def test_short_opinions_are_unchanged():
+    """Opinions already under the target are returned as-is"""
+    assert digest_opinion("Ship it.", 100) == "Ship it."
+
+
+def test_digest_is_extractive_and_bounded():
+    """Digests fit the target and only contain original sentences in order"""
+    digest = digest_opinion(LONG_OPINION, 200)
+    assert len(digest) <= 200
+    assert digest, "Digest should not be empty"
+
+    positions = [LONG_OPINION.index(sentence) for sentence in digest.split(". ") if sentence]
+    assert positions == sorted(positions), "Sentences should keep their original order"
+    assert "coffee" not in digest, "Off-topic sentences should be dropped first"
+
+
+def test_digest_is_deterministic():
+    """Same input always gives the same digest"""
+    assert digest_opinion(LONG_OPINION, 150) == digest_opinion(LONG_OPINION, 150)
+
+
+def test_digest_opinions_keeps_originals():
+    """Digesting returns copies and leaves stored opinions intact"""
+    opinions = {1: {"member_id": 1, "member_name": "The Pragmatist", "opinion": LONG_OPINION}}
+    digested = digest_opinions(opinions, 120)
+
+    assert len(digested[1]["opinion"]) <= 120
+    assert opinions[1]["opinion"] == LONG_OPINION
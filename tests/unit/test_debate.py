@@ -0,0 +1,29 @@
+"""
+Debate tests for Council of Mine MCP Server
+"""
+
+from mcp_council_of_mine.council.members import get_all_members
+from mcp_council_of_mine.tools.debate import parse_batched_opinions
+
+
+def test_parse_batched_opinions_json():
+    """JSON objects keyed by member number or name are split per member"""
+    response = '```json\n{"1": "Ship it.", "2": "Dream bigger.", "The Analyst": "Measure first."}\n```'
+    opinions = parse_batched_opinions(response, get_all_members())
+    assert opinions == {1: "Ship it.", 2: "Dream bigger.", 9: "Measure first."}
+
+
+def test_parse_batched_opinions_delimited():
+    """Delimited sections are accepted when the response is not JSON"""
+    response = "=== MEMBER 4 ===\nGreat opportunity.\n\n=== MEMBER 5 ===\nWhat if we're wrong?"
+    opinions = parse_batched_opinions(response, get_all_members())
+    assert opinions == {4: "Great opportunity.", 5: "What if we're wrong?"}
+
+
+def test_parse_batched_opinions_ignores_unknown_and_empty():
+    """Unknown members and empty opinions are dropped so they fall back"""
+    response = '{"opinions": [{"member_id": 3, "opinion": "Ripple effects."}, {"member_id": 42, "opinion": "x"}, {"member_id": 6, "opinion": " "}]}'
+    opinions = parse_batched_opinions(response, get_all_members())
+    assert opinions == {3: "Ripple effects."}
+
+    assert parse_batched_opinions("not structured at all", get_all_members()) == {}
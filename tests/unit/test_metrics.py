@@ -0,0 +1,62 @@
+"""
+Metrics tests for Council of Mine MCP Server
+"""
+
+import asyncio
+
+from mcp_council_of_mine import metrics as metrics_module
+from mcp_council_of_mine.fake_sampling import FakeContext
+from mcp_council_of_mine.metrics import MetricsRegistry
+from mcp_council_of_mine.resilience import retry_phase
+from mcp_council_of_mine.sampling import sample_text
+
+
+def test_counters_and_histograms_snapshot():
+    """Counters add up per label set and histograms bucket observations"""
+    registry = MetricsRegistry()
+    registry.inc("council_sampling_calls_total", phase="voting")
+    registry.inc("council_sampling_calls_total", phase="voting")
+    registry.observe("council_sampling_latency_seconds", 0.3, phase="voting")
+    registry.observe("council_sampling_latency_seconds", 12.0, phase="voting")
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"council_sampling_calls_total{phase=voting}": 2}
+    histogram = snapshot["histograms"]["council_sampling_latency_seconds{phase=voting}"]
+    assert histogram["count"] == 2
+    assert histogram["buckets"]["0.5"] == 1
+    assert histogram["buckets"]["30.0"] == 1
+
+
+def test_prometheus_text_format(tmp_path):
+    """Prometheus output has HELP/TYPE lines and cumulative buckets, written atomically"""
+    registry = MetricsRegistry(prometheus_file=str(tmp_path / "council.prom"))
+    registry.inc("council_invalid_ballots_total", mode="batched")
+    registry.observe("council_debate_save_seconds", 0.02)
+    registry.observe("council_debate_save_seconds", 0.2)
+
+    text = registry.to_prometheus()
+    assert "# TYPE council_invalid_ballots_total counter" in text
+    assert 'council_invalid_ballots_total{mode="batched"} 1' in text
+    assert 'council_debate_save_seconds_bucket{le="0.05"} 1' in text
+    assert 'council_debate_save_seconds_bucket{le="+Inf"} 2' in text
+    assert "council_debate_save_seconds_count 2" in text
+
+    assert registry.write_prometheus() == str(tmp_path / "council.prom")
+    assert (tmp_path / "council.prom").read_text() == text
+    assert [path.name for path in tmp_path.iterdir()] == ["council.prom"]
+
+
+def test_sampling_is_recorded_per_phase(monkeypatch):
+    """sample_text labels calls, latency and sizes with the active phase"""
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_module, "_metrics", registry)
+
+    async def sample_in_phase():
+        with retry_phase("synthesis"):
+            await sample_text(FakeContext(), "Generate a balanced synthesis", temperature=0.7, max_tokens=300, use_cache=False)
+
+    asyncio.run(sample_in_phase())
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"]["council_sampling_calls_total{phase=synthesis}"] == 1
+    assert snapshot["histograms"]["council_response_chars{phase=synthesis}"]["count"] == 1
@@ -0,0 +1,138 @@
+"""
+Write-behind debate persistence tests for Council of Mine MCP Server
+"""
+
+import os
+import json
+import asyncio
+import threading
+
+import pytest
+
+from mcp_council_of_mine import tracing
+from mcp_council_of_mine.council import persistence
+from mcp_council_of_mine.council.persistence import write_atomic
+from mcp_council_of_mine.council.storage import decode_debate, encode_debate
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.tools.history import list_past_debates, search_debates
+
+
+def test_save_returns_before_the_write_and_reads_stay_consistent(tmp_path):
+    """Saving only queues the debate; it is readable at once and on disk after flush"""
+    release = threading.Event()
+    state = StateManager(debates_dir=str(tmp_path))
+
+    def slow_serialize(debate: dict) -> bytes:
+        release.wait(timeout=5)
+        return encode_debate(debate)
+
+    state.writer.serialize = slow_serialize
+    debate_id = state.start_new_debate("Should saves block the event loop?")
+    file_path = state.save_current_debate(debate_id)
+    state.clear_current_debate(debate_id)
+
+    assert not os.path.exists(file_path)
+    assert state.load_debate(debate_id)["prompt"] == "Should saves block the event loop?"
+    assert state.start_new_debate("Another topic") != debate_id
+
+    release.set()
+    state.close()
+
+    assert decode_debate(open(file_path, "rb").read())["debate_id"] == debate_id
+    assert [d["debate_id"] for d in StateManager(debates_dir=str(tmp_path)).list_debates()] == [debate_id]
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path, monkeypatch):
+    """A crash before the rename leaves the old contents and no temp file behind"""
+    target = tmp_path / "20250101_000000.debate"
+    write_atomic(target, b'{"version": 1}')
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(persistence.os, "replace", crash)
+    with pytest.raises(OSError):
+        write_atomic(target, b'{"version": 2}')
+
+    assert target.read_bytes() == b'{"version": 1}'
+    assert [path.name for path in tmp_path.iterdir()] == [target.name]
+
+
+def test_writer_failure_is_logged_not_raised(tmp_path):
+    """A debate that cannot be written is dropped from pending and the writer keeps going"""
+    state = StateManager(debates_dir=str(tmp_path))
+
+    def fail(debate: dict) -> bytes:
+        raise TypeError("not serializable")
+
+    state.writer.serialize = fail
+    broken = state.start_new_debate("Unwritable")
+    state.save_current_debate(broken)
+    state.clear_current_debate(broken)
+    state.flush()
+    state.writer.serialize = encode_debate
+
+    kept = state.start_new_debate("Writable")
+    state.save_current_debate(kept)
+    state.flush()
+
+    assert state.writer.pending == {}
+    assert [d["debate_id"] for d in state.list_debates()] == [kept]
+
+
+def test_background_write_is_traced_under_the_saving_call(tmp_path, monkeypatch):
+    """The writer thread's span carries the debate_id and joins the caller's trace"""
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer(str(trace_file)))
+    state = StateManager(debates_dir=str(tmp_path / "debates"))
+    debate_id = state.start_new_debate("Are writes traced?")
+
+    with tracing.span("tool/get_results"):
+        state.save_current_debate(debate_id)
+    state.flush()
+
+    spans = {
+        span["name"]: span
+        for line in trace_file.read_text().splitlines()
+        for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    }
+    write = spans["state/write"]
+    assert write["traceId"] == spans["tool/get_results"]["traceId"]
+    assert {"key": "debate_id", "value": {"stringValue": debate_id}} in write["attributes"]
+
+
+def test_listing_and_search_do_not_block_on_queued_writes(tmp_path, monkeypatch):
+    """Listing serves queued debates from their snapshots; search waits off the event loop"""
+    release = threading.Event()
+    state = StateManager(debates_dir=str(tmp_path))
+    monkeypatch.setattr(state_module, "_state_manager", state)
+
+    def slow_serialize(debate: dict) -> bytes:
+        release.wait(timeout=5)
+        return encode_debate(debate)
+
+    saved = state.start_new_debate("Should listing wait for the disk?")
+    state.save_current_debate(saved)
+    state.writer.serialize = slow_serialize
+    queued = state.start_new_debate("Queued behind a slow write")
+    state.set_results({"synthesis": "No."}, debate_id=queued)
+    state.save_current_debate(queued)
+    state.save_current_debate(saved)
+
+    listing = list_past_debates.fn(limit=1)
+    assert [d["debate_id"] for d in listing["debates"]] == [queued]
+    assert listing["debates"][0]["has_results"] and listing["total_debates"] == 2
+    assert [d["debate_id"] for d in state.list_debates(has_results=False)] == [saved]
+    assert not release.is_set()
+
+    async def search_while_writing():
+        search = asyncio.create_task(search_debates.fn("slow write"))
+        await asyncio.sleep(0.05)
+        # The loop kept running while search waited for the writer
+        assert not search.done()
+        release.set()
+        return await search
+
+    response = asyncio.run(search_while_writing())
+    assert [hit["debate_id"] for hit in response["results"]] == [queued]
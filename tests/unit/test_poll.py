@@ -0,0 +1,69 @@
+"""
+Quick poll tests for Council of Mine MCP Server
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from mcp_council_of_mine.council.members import get_all_members
+from mcp_council_of_mine.tools.poll import parse_batched_stances, parse_stance, quick_poll
+
+
+class StanceContext:
+    """Context where even-numbered members disagree and member 9 gives no stance"""
+
+    def __init__(self):
+        self.max_tokens = []
+
+    async def sample(self, messages, max_tokens=None, **kwargs):
+        self.max_tokens.append(max_tokens)
+        member_id = next(
+            m["id"] for m in get_all_members() if f"As {m['name']} " in messages
+        )
+        if member_id == 9:
+            text = "I would rather not say."
+        else:
+            stance = "disagree" if member_id % 2 == 0 else "agree"
+            text = f"STANCE: {stance}\nREASON: Member {member_id} reasoning."
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+    async def info(self, *args, **kwargs):
+        pass
+
+    async def warning(self, *args, **kwargs):
+        pass
+
+    async def report_progress(self, *args, **kwargs):
+        pass
+
+    async def log(self, *args, **kwargs):
+        pass
+
+
+def test_parse_stance_structured_and_fallback():
+    """STANCE/REASON responses parse, and a bare stance word is accepted"""
+    assert parse_stance("STANCE: Agree\nREASON: It is cheap.") == ("agree", "It is cheap.")
+    assert parse_stance("I disagree, it is too risky.")[0] == "disagree"
+    assert parse_stance("No idea.") == (None, "")
+
+
+def test_parse_batched_stances_skips_unknown_members():
+    """Batched stances are split per member; unknown members are dropped"""
+    members = get_all_members()
+    response = (
+        "MEMBER 1:\nSTANCE: agree\nREASON: Practical.\n\n"
+        "MEMBER 42:\nSTANCE: agree\nREASON: Not a member.\n"
+    )
+    assert parse_batched_stances(response, members) == {1: ("agree", "Practical.")}
+
+
+def test_quick_poll_returns_tally():
+    """Every usable stance is tallied using small sampling calls only"""
+    ctx = StanceContext()
+    result = asyncio.run(quick_poll.fn("Tabs are better than spaces", ctx, use_cache=False))
+
+    assert result["tally"] == {"agree": 4, "disagree": 4, "neutral": 0}
+    assert result["majority"] == "split"
+    assert result["no_response"] == ["The Analyst"]
+    assert len(ctx.max_tokens) == 9
+    assert max(ctx.max_tokens) <= 50, "Polls should use tiny completions"
@@ -0,0 +1,54 @@
+"""
+Profiling tests for Council of Mine MCP Server
+"""
+
+from pathlib import Path
+
+from mcp_council_of_mine.profiling import REPORT_FILE, Profiler, profile_file_prefix
+from mcp_council_of_mine.security import sanitize_text
+
+
+def test_profiled_calls_are_saved_and_aggregated(tmp_path):
+    """Each profiled call gets a .prof file and feeds the hot-function report"""
+    profiler = Profiler(enabled=True, sample_rate=1.0, profile_dir=str(tmp_path))
+
+    for _ in range(2):
+        profile = profiler.start()
+        assert profile is not None
+        sanitize_text("x" * 5000, max_length=10000)
+        profiler.finish(profile, "get_results")
+
+    assert len(list(tmp_path.glob("get_results_*.prof"))) == 2
+    assert "sanitize_text" in (tmp_path / REPORT_FILE).read_text()
+
+    hot = profiler.hot_functions(limit=50, sort="cumtime")
+    assert any("sanitize_text" in row["function"] and row["calls"] == 2 for row in hot)
+
+
+def test_disabled_or_unsampled_calls_are_not_profiled(tmp_path):
+    """No profile starts when profiling is off or the call is not sampled"""
+    assert Profiler(enabled=False, sample_rate=1.0, profile_dir=str(tmp_path)).start() is None
+    assert Profiler(enabled=True, sample_rate=0.0, profile_dir=str(tmp_path)).start() is None
+
+
+def test_only_one_call_profiled_at_a_time(tmp_path):
+    """Overlapping calls run unprofiled while another call is being profiled"""
+    profiler = Profiler(enabled=True, sample_rate=1.0, profile_dir=str(tmp_path))
+    first = profiler.start()
+    assert profiler.start() is None
+    profiler.finish(first, "quick_poll")
+    assert profiler.profiled_calls == 1
+
+
+def test_profile_files_stay_inside_the_profile_directory(tmp_path):
+    """Client-supplied tool names cannot steer the .prof path elsewhere"""
+    profile_dir = tmp_path / "profiles"
+    profiler = Profiler(enabled=True, sample_rate=1.0, profile_dir=str(profile_dir))
+
+    profile = profiler.start()
+    path = profiler.finish(profile, "../ESCAPED")
+
+    assert Path(path).parent == profile_dir
+    assert not list(tmp_path.glob("ESCAPED*"))
+    assert profile_file_prefix("../../etc/passwd") == "______etc_passwd"
+    assert profile_file_prefix("") == "tool"
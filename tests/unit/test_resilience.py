@@ -0,0 +1,108 @@
+"""
+Sampling resilience tests for Council of Mine MCP Server
+"""
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import METHOD_NOT_FOUND, ErrorData
+
+from mcp_council_of_mine import resilience
+from mcp_council_of_mine.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    call_with_retries,
+    get_circuit_breaker,
+)
+
+
+def flaky(failures: int, error: Exception):
+    """Factory that fails `failures` times before succeeding"""
+    calls = {"count": 0}
+
+    async def call() -> str:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise error
+        return "ok"
+
+    return call, calls
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    """Timeouts are retried until the call succeeds"""
+    monkeypatch.setenv("COUNCIL_RETRY_BASE_DELAY", "0.001")
+    call, calls = flaky(2, TimeoutError("slow client"))
+
+    result = asyncio.run(call_with_retries(call, breaker=CircuitBreaker(), max_attempts=3))
+    assert result == "ok"
+    assert calls["count"] == 3
+
+
+def test_permanent_errors_are_not_retried():
+    """Errors such as missing sampling support fail immediately"""
+    call, calls = flaky(1, ValueError("Client does not support sampling"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(call_with_retries(call, breaker=CircuitBreaker(), max_attempts=3))
+    assert calls["count"] == 1
+
+
+def test_retry_budget_limits_retries(monkeypatch):
+    """A phase budget stops retries once it is spent"""
+    monkeypatch.setenv("COUNCIL_RETRY_BASE_DELAY", "0.001")
+    budget = RetryBudget(max_retries=1, deadline_seconds=60)
+    call, calls = flaky(5, TimeoutError("slow client"))
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(call_with_retries(call, breaker=CircuitBreaker(), budget=budget, max_attempts=5))
+    assert calls["count"] == 2, "One initial attempt plus one budgeted retry"
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """The breaker fails fast when open and closes after a successful trial"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.01)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    call, calls = flaky(0, TimeoutError())
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_with_retries(call, breaker=breaker))
+    assert calls["count"] == 0, "Open breaker should not call the client"
+
+    asyncio.run(asyncio.sleep(0.02))
+    assert asyncio.run(call_with_retries(call, breaker=breaker)) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_permanent_errors_do_not_trip_the_breaker():
+    """A client without sampling support never opens the breaker"""
+    breaker = CircuitBreaker(failure_threshold=2)
+    call, _ = flaky(10, McpError(ErrorData(code=METHOD_NOT_FOUND, message="Method not found")))
+
+    for _ in range(5):
+        with pytest.raises(McpError):
+            asyncio.run(call_with_retries(call, breaker=breaker))
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_breakers_are_kept_per_session(monkeypatch):
+    """One session's failures never open another session's breaker"""
+    monkeypatch.setattr(resilience, "_circuit_breakers", OrderedDict())
+    monkeypatch.setattr(resilience, "MAX_TRACKED_SESSIONS", 2)
+
+    for _ in range(get_circuit_breaker("alice").failure_threshold):
+        get_circuit_breaker("alice").record_failure()
+
+    assert get_circuit_breaker("alice").state == CircuitBreaker.OPEN
+    assert get_circuit_breaker("bob").state == CircuitBreaker.CLOSED
+    assert get_circuit_breaker("bob") is get_circuit_breaker("bob")
+
+    get_circuit_breaker("carol")
+    assert list(resilience._circuit_breakers) == ["bob", "carol"]
@@ -0,0 +1,127 @@
+"""
+Sampling helper tests for Council of Mine MCP Server
+"""
+
+import asyncio
+
+from mcp_council_of_mine.council.members import get_all_members
+from mcp_council_of_mine.sampling import (
+    HedgePolicy,
+    format_member_blocks,
+    gather_limited,
+    hedged_call,
+    split_member_sections,
+)
+
+
+def test_gather_limited_preserves_order():
+    """Results come back in input order regardless of completion order"""
+
+    async def delayed(value: int, delay: float) -> int:
+        await asyncio.sleep(delay)
+        return value
+
+    factories = [
+        lambda value=value: delayed(value, 0.01 * (5 - value))
+        for value in range(5)
+    ]
+
+    results = asyncio.run(gather_limited(factories, limit=5))
+    assert results == [0, 1, 2, 3, 4], "Results should follow input order"
+
+
+def test_gather_limited_respects_cap():
+    """No more than `limit` factories run at once"""
+    in_flight = 0
+    peak = 0
+
+    async def tracked() -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    asyncio.run(gather_limited([tracked for _ in range(9)], limit=3))
+    assert peak == 3, f"Expected at most 3 concurrent calls, saw {peak}"
+
+
+def test_gather_limited_isolates_failures():
+    """One failing factory does not cancel the others"""
+
+    async def ok() -> str:
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def boom() -> str:
+        raise RuntimeError("sampling failed")
+
+    results = asyncio.run(gather_limited([ok, boom, ok]))
+    assert results[0] == "ok"
+    assert isinstance(results[1], RuntimeError), "Failure should be returned, not raised"
+    assert results[2] == "ok"
+
+
+def test_hedged_call_uses_faster_duplicate():
+    """A straggling call is hedged and the faster duplicate wins"""
+    policy = HedgePolicy(enabled=True, min_delay=0.01, max_hedge_rate=1.0, min_observations=1)
+    policy.record_latency(0.01)
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def call() -> float:
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    async def run() -> float:
+        result = await hedged_call(call, policy)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == 0.01, "Duplicate should win"
+    assert cancelled == [1.0], "Straggler should be cancelled"
+    assert policy.hedges == 1 and policy.hedge_wins == 1
+
+
+def test_hedged_call_respects_rate_cap():
+    """No hedge is issued when it would exceed the hedge rate cap"""
+    policy = HedgePolicy(enabled=True, min_delay=0.001, max_hedge_rate=0.0, min_observations=1)
+    policy.record_latency(0.001)
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "done"
+
+    assert asyncio.run(hedged_call(call, policy)) == "done"
+    assert calls == 1 and policy.hedges == 0
+
+
+def test_split_member_sections_accepts_common_headers():
+    """Plain, markdown and banner-style member headers all start a section"""
+    response = "Preamble\nMEMBER 1:\nfirst\n**Member 2**\nsecond\n=== Member 3 ===\nthird"
+
+    sections = [(member_id, text.strip()) for member_id, text in split_member_sections(response)]
+
+    assert sections == [(1, "first"), (2, "second"), (3, "third")]
+
+
+def test_format_member_blocks_keeps_first_personality_paragraph():
+    """Full blocks carry one personality paragraph; short blocks are one line per member"""
+    members = get_all_members()[:2]
+
+    full = format_member_blocks(members)
+    short = format_member_blocks(members, with_personality=False)
+
+    assert full.count("\n\n") == 1
+    assert members[0]["personality"].split("\n\n")[0] in full
+    assert short.splitlines() == [
+        f"Member {m['id']}: {m['name']} (the {m['archetype']})" for m in members
+    ]
@@ -0,0 +1,111 @@
+"""
+Debate history search tests for Council of Mine MCP Server
+"""
+
+import asyncio
+
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.council.search import make_snippet, tokenize
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.council.storage import shard_dir
+from mcp_council_of_mine.tools.history import search_debates
+
+
+def save_debate(state: StateManager, prompt: str, opinions: list[str], synthesis: str) -> str:
+    debate_id = state.start_new_debate(prompt)
+    for member_id, opinion in enumerate(opinions, start=1):
+        state.add_opinion(member_id, f"Member {member_id}", opinion, debate_id=debate_id)
+    state.add_vote(1, 2, "Member 2 made the strongest case.", debate_id=debate_id)
+    state.set_results({"synthesis": synthesis}, debate_id=debate_id)
+    state.save_current_debate(debate_id)
+    state.clear_current_debate(debate_id)
+    state.flush()
+    return debate_id
+
+
+def seed_history(state: StateManager) -> dict[str, str]:
+    return {
+        "kubernetes": save_debate(
+            state,
+            "Should we move our services to Kubernetes?",
+            ["Kubernetes adds operational overhead.", "Containers make deploys repeatable."],
+            "The council favors a gradual Kubernetes migration."
+        ),
+        "pricing": save_debate(
+            state,
+            "Should we raise prices next quarter?",
+            ["Customers will churn.", "Our costs went up; a migration to annual plans helps."],
+            "Raise prices modestly and grandfather existing customers."
+        ),
+        "hiring": save_debate(
+            state,
+            "Should we hire a dedicated designer?",
+            ["Design debt slows every release.", "Contractors are cheaper."],
+            "Hire one designer and revisit in six months."
+        ),
+    }
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    """Queries and documents reduce to the same lowercase content terms"""
+    assert tokenize("Should WE move to Kubernetes? It's time!") == ["move", "kubernetes", "time"]
+
+
+def test_search_ranks_topic_matches_first(tmp_path):
+    """A term in the prompt outranks the same term buried in an opinion"""
+    state = StateManager(debates_dir=str(tmp_path))
+    ids = seed_history(state)
+
+    hits, total = state.search_debates("kubernetes migration")
+
+    assert total == 2
+    assert [hit["debate_id"] for hit in hits] == [ids["kubernetes"], ids["pricing"]]
+    assert hits[0]["matched_in"] in ("prompt", "synthesis")
+    assert "Kubernetes" in hits[0]["snippet"]
+    assert state.search_debates("blockchain") == ([], 0)
+
+
+def test_search_index_persists_and_catches_up(tmp_path):
+    """A restarted server reuses the saved index and indexes only debates it has not seen"""
+    state = StateManager(debates_dir=str(tmp_path))
+    ids = seed_history(state)
+
+    restarted = StateManager(debates_dir=str(tmp_path))
+    assert restarted.search_index.refresh() == 0
+
+    (shard_dir(tmp_path, ids["hiring"]) / f"{ids['hiring']}.debate").unlink()
+    newer = save_debate(StateManager(debates_dir=str(tmp_path)), "Hire a designer or an agency?", ["Agency."], "Agency.")
+
+    hits, _ = restarted.search_debates("designer")
+    assert [hit["debate_id"] for hit in hits] == [newer]
+
+
+def test_snippet_centers_on_the_match():
+    """Snippets come from the best matching field and are trimmed at word boundaries"""
+    debate = {
+        "prompt": "Quarterly planning",
+        "opinions": {"1": {"member_id": 1, "member_name": "The Skeptic", "opinion": "word " * 80 + "latency budget matters " + "word " * 80}},
+        "votes": {},
+        "results": None,
+    }
+
+    matched_in, snippet = make_snippet(debate, {"latency"})
+
+    assert matched_in == "opinion by The Skeptic"
+    assert "latency budget" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+
+
+def test_search_debates_tool_validates_query(tmp_path, monkeypatch):
+    """The tool rejects empty queries and clamps the result count"""
+    state = StateManager(debates_dir=str(tmp_path))
+    seed_history(state)
+    monkeypatch.setattr(state_module, "_state_manager", state)
+
+    assert "error" in asyncio.run(search_debates.fn("   "))
+
+    response = asyncio.run(search_debates.fn("should", limit=500))
+    assert response["total_matches"] == 0
+    response = asyncio.run(search_debates.fn("prices customers", limit=0))
+    assert response["total_matches"] == 1
+    assert len(response["results"]) == 1
@@ -39,6 +39,7 @@ def test_path_traversal_prevention():
         "20251114_123456",
         "20250101_000000",
         "20991231_235959",
+        "20251114_123456_2",
     ]
 
     for debate_id in valid_ids:
@@ -0,0 +1,232 @@
+"""
+Debate state tests for Council of Mine MCP Server
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from mcp_council_of_mine.council import state as state_module
+from mcp_council_of_mine.council.index import encode_cursor
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.council.storage import shard_dir
+from mcp_council_of_mine.fake_sampling import FakeContext
+from mcp_council_of_mine.security import validate_debate_id
+from mcp_council_of_mine.tools.history import get_current_debate_status, list_past_debates
+
+
+def test_debates_started_together_get_unique_ids(tmp_path):
+    """Debates started within the same second are suffixed, not overwritten"""
+    state = StateManager(debates_dir=str(tmp_path))
+
+    debate_ids = [state.start_new_debate(f"Topic {n}") for n in range(3)]
+
+    assert len(set(debate_ids)) == 3
+    assert all(validate_debate_id(debate_id) for debate_id in debate_ids)
+    assert [state.get_current_debate(d)["prompt"] for d in debate_ids] == ["Topic 0", "Topic 1", "Topic 2"]
+
+
+def test_debates_resolve_per_session(tmp_path):
+    """Each session resolves only its own debates, with or without a debate_id"""
+    state = StateManager(debates_dir=str(tmp_path))
+    first = state.start_new_debate("Alice's topic", session_id="alice")
+    second = state.start_new_debate("Bob's topic", session_id="bob")
+
+    assert state.resolve_debate_id(session_id="alice") == first
+    assert state.resolve_debate_id(session_id="bob") == second
+    assert state.resolve_debate_id(session_id="carol") is None
+    assert state.resolve_debate_id(first, session_id="alice") == first
+    assert state.resolve_debate_id(first, session_id="bob") is None
+    assert state.get_current_debate(first, session_id="bob") is None
+    assert state.get_current_debate()["debate_id"] == second
+
+    state.add_opinion(1, "The Pragmatist", "Ship it.", debate_id=first)
+    assert state.get_current_debate(first)["opinions"]
+    assert not state.get_current_debate(second)["opinions"]
+
+
+def test_status_lists_only_the_callers_debates(tmp_path, monkeypatch):
+    """get_current_debate_status never reveals other sessions' debate IDs"""
+    state = StateManager(debates_dir=str(tmp_path))
+    monkeypatch.setattr(state_module, "_state_manager", state)
+    first = state.start_new_debate("Alice's topic", session_id="alice")
+    bobs = state.start_new_debate("Bob's topic", session_id="bob")
+
+    status = get_current_debate_status.fn(debate_id=bobs, ctx=FakeContext(session_id="alice"))
+    assert status["status"] == "no_active_debate"
+
+    status = get_current_debate_status.fn(ctx=FakeContext(session_id="alice"))
+    assert status["debate_id"] == first
+    assert status["active_debates"] == [first]
+
+    status = get_current_debate_status.fn(ctx=FakeContext(session_id="carol"))
+    assert status["status"] == "no_active_debate"
+    assert status["active_debates"] == []
+
+
+def test_abandoned_debates_are_dropped(tmp_path):
+    """Idle debates expire and each session keeps at most its cap, sparing locked debates"""
+    state = StateManager(debates_dir=str(tmp_path))
+    state.max_per_session = 2
+
+    first = state.start_new_debate("First", session_id="alice")
+    second = state.start_new_debate("Second", session_id="alice")
+    bobs = state.start_new_debate("Bob's", session_id="bob")
+    third = state.start_new_debate("Third", session_id="alice")
+    assert state.list_active_debates("alice") == [second, third]
+    assert state.list_active_debates("bob") == [bobs]
+
+    state.last_used[bobs] -= state.idle_ttl + 1
+    state.last_used[second] -= state.idle_ttl + 1
+    state.get_current_debate(second)
+    state.start_new_debate("Carol's", session_id="carol")
+    assert bobs not in state.active_debates and bobs not in state.debate_sessions
+    assert second in state.active_debates
+
+    async def start_while_locked():
+        async with state.debate_lock(second):
+            return state.start_new_debate("Fourth", session_id="alice")
+
+    fourth = asyncio.run(start_while_locked())
+    assert state.list_active_debates("alice") == [second, fourth]
+    assert first not in state.last_used and fourth != first
+
+
+def test_clearing_one_debate_leaves_others_active(tmp_path):
+    """Finishing a debate retires only that debate and its lock"""
+    state = StateManager(debates_dir=str(tmp_path))
+    first = state.start_new_debate("First", session_id="alice")
+    second = state.start_new_debate("Second", session_id="alice")
+    state.debate_lock(second)
+
+    saved_path = state.save_current_debate(second)
+    state.clear_current_debate(second)
+    state.flush()
+
+    assert state.list_active_debates() == [first]
+    assert state.resolve_debate_id(session_id="alice") == first
+    assert os.path.exists(saved_path)
+    assert state.debate_lock(first) is state.debate_lock(first)
+
+
+def save_debate(state: StateManager, prompt: str, with_results: bool = True) -> str:
+    debate_id = state.start_new_debate(prompt)
+    if with_results:
+        state.set_results({"synthesis": "Done"}, debate_id=debate_id)
+    state.save_current_debate(debate_id)
+    state.clear_current_debate(debate_id)
+    state.flush()
+    return debate_id
+
+
+def test_listing_is_served_from_the_index(tmp_path):
+    """A restarted server lists saved debates without re-reading their files"""
+    state = StateManager(debates_dir=str(tmp_path))
+    first = save_debate(state, "First")
+    second = save_debate(state, "Second", with_results=False)
+
+    restarted = StateManager(debates_dir=str(tmp_path))
+    assert restarted.index.refresh() == 0
+    listed = [(d["debate_id"], d["prompt"], d["has_results"]) for d in restarted.list_debates()]
+    assert listed == [(second, "Second", False), (first, "First", True)]
+
+
+def test_index_catches_up_with_files_changed_behind_its_back(tmp_path):
+    """Files added, edited or removed outside the server are reconciled by mtime"""
+    state = StateManager(debates_dir=str(tmp_path))
+    kept = save_debate(state, "Kept")
+    removed = save_debate(state, "Removed")
+    assert len(state.list_debates()) == 2
+
+    (shard_dir(tmp_path, removed) / f"{removed}.debate").unlink()
+    (tmp_path / "20200101_000000.json").write_text(json.dumps({
+        "debate_id": "20200101_000000",
+        "prompt": "Copied in from a backup",
+        "timestamp": "2020-01-01T00:00:00",
+        "results": None
+    }))
+    with open(tmp_path / "index.jsonl", "a") as f:
+        f.write('{"debate_id": "2025')
+
+    restarted = StateManager(debates_dir=str(tmp_path))
+    listed = {d["debate_id"]: d["prompt"] for d in restarted.list_debates()}
+    assert listed == {kept: "Kept", "20200101_000000": "Copied in from a backup"}
+
+
+def write_debate(debates_dir, debate_id: str, has_results: bool):
+    (debates_dir / f"{debate_id}.json").write_text(json.dumps({
+        "debate_id": debate_id,
+        "prompt": f"Topic {debate_id}",
+        "timestamp": "2025-01-01T00:00:00",
+        "results": {"synthesis": "Done"} if has_results else None
+    }))
+
+
+def test_list_debates_pages_with_cursor_and_filters(tmp_path):
+    """Pages follow the cursor newest first; date and has_results filters narrow them"""
+    debate_ids = [f"202501{day:02d}_120000" for day in range(1, 11)]
+    for n, debate_id in enumerate(debate_ids):
+        write_debate(tmp_path, debate_id, has_results=n % 2 == 0)
+    state = StateManager(debates_dir=str(tmp_path))
+
+    first_page = state.list_debates(limit=4)
+    assert [d["debate_id"] for d in first_page] == debate_ids[::-1][:4]
+
+    cursor = encode_cursor(first_page[-1]["debate_id"])
+    second_page = state.list_debates(limit=4, cursor=cursor)
+    assert [d["debate_id"] for d in second_page] == debate_ids[::-1][4:8]
+
+    in_range = state.list_debates(since="2025-01-03", until="2025-01-05")
+    assert [d["debate_id"] for d in in_range] == debate_ids[4:1:-1]
+
+    finished = state.list_debates(has_results=True, until="2025-01-06T00:00:00")
+    assert [d["debate_id"] for d in finished] == ["20250105_120000", "20250103_120000", "20250101_120000"]
+
+
+def test_list_debates_rejects_bad_cursor_and_dates(tmp_path):
+    """A tampered cursor or an unparseable date is an error, not a silent full listing"""
+    state = StateManager(debates_dir=str(tmp_path))
+
+    for kwargs in ({"cursor": encode_cursor("../../etc/passwd")}, {"cursor": "!!"}, {"since": "last week"}):
+        with pytest.raises(ValueError):
+            state.list_debates(**kwargs)
+
+
+def test_list_past_debates_walks_every_page(tmp_path, monkeypatch):
+    """Following next_cursor visits each debate exactly once and ends with null"""
+    for day in range(1, 8):
+        write_debate(tmp_path, f"202502{day:02d}_090000", has_results=True)
+    monkeypatch.setattr(state_module, "_state_manager", StateManager(debates_dir=str(tmp_path)))
+
+    seen = []
+    page = list_past_debates.fn(limit=3)
+    while True:
+        assert page["total_debates"] == 7
+        seen.extend(d["debate_id"] for d in page["debates"])
+        if page["next_cursor"] is None:
+            break
+        page = list_past_debates.fn(limit=3, cursor=page["next_cursor"])
+
+    assert seen == [f"202502{day:02d}_090000" for day in range(7, 0, -1)]
+    assert "error" in list_past_debates.fn(cursor="not-a-cursor")
+
+
+@pytest.mark.parametrize("layout", ["sharded", "flat"])
+def test_saving_into_the_working_directory(tmp_path, monkeypatch, layout):
+    """COUNCIL_DEBATES_DIR=. saves and lists like any other directory"""
+    monkeypatch.chdir(tmp_path)
+    state = StateManager(debates_dir=".", layout=layout)
+    state.list_debates()
+    debate_id = state.start_new_debate("Here")
+    state.save_current_debate(debate_id)
+
+    flushing = threading.Thread(target=state.flush, daemon=True)
+    flushing.start()
+    flushing.join(timeout=5)
+
+    assert not flushing.is_alive(), "writer thread never finished recording the save"
+    assert state.writer.pending_debate(debate_id) is None
+    assert [d["debate_id"] for d in state.list_debates()] == [debate_id]
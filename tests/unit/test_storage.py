@@ -0,0 +1,167 @@
+"""
+Debate storage format and migration tests for Council of Mine MCP Server
+"""
+
+import json
+
+import pytest
+
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.council.storage import FORMAT_VERSION, MAGIC, decode_debate, encode_debate, shard_dir
+from mcp_council_of_mine.migrate import main as migrate_main, migrate_format, migrate_layout
+
+
+def sample_debate(debate_id: str = "20250301_101500") -> dict:
+    return {
+        "debate_id": debate_id,
+        "prompt": "Should we adopt a four-day work week? ✓",
+        "timestamp": "2025-03-01T10:15:00",
+        "opinions": {
+            str(member_id): {
+                "member_id": member_id,
+                "member_name": f"Member {member_id}",
+                "opinion": "A shorter week forces us to prioritize what matters. " * 6
+            }
+            for member_id in range(1, 10)
+        },
+        "votes": {},
+        "results": {"synthesis": "Pilot it with one team."}
+    }
+
+
+def write_legacy(debates_dir, debate: dict):
+    (debates_dir / f"{debate['debate_id']}.json").write_text(json.dumps(debate, indent=2))
+
+
+@pytest.mark.parametrize("compression", ["zlib", "none"])
+def test_encoding_round_trips_with_a_version_header(compression):
+    """Both codecs decode to the same debate and carry a readable header"""
+    debate = sample_debate()
+    data = encode_debate(debate, compression)
+
+    assert data.startswith(MAGIC + f" {FORMAT_VERSION} {compression}\n".encode())
+    assert decode_debate(data) == debate
+
+
+def test_compact_format_is_smaller_and_reads_legacy_json():
+    """Legacy pretty-printed JSON still decodes, and the new format is much smaller"""
+    debate = sample_debate()
+    legacy = json.dumps(debate, indent=2).encode()
+
+    assert decode_debate(legacy) == debate
+    assert len(encode_debate(debate, "none")) < len(legacy)
+    assert len(encode_debate(debate, "zlib")) < len(legacy) / 4
+
+
+def test_unreadable_files_are_rejected():
+    """Newer versions, unknown codecs and corrupt bodies raise ValueError"""
+    for data in (
+        MAGIC + f" {FORMAT_VERSION + 1} none\n{{}}".encode(),
+        MAGIC + f" {FORMAT_VERSION} brotli\n{{}}".encode(),
+        MAGIC + f" {FORMAT_VERSION} zlib\nnot compressed".encode(),
+        b'{"debate_id": ',
+    ):
+        with pytest.raises(ValueError):
+            decode_debate(data)
+
+
+def test_state_reads_both_formats_side_by_side(tmp_path):
+    """Legacy files and newly saved debates are listed and loaded alike"""
+    write_legacy(tmp_path, sample_debate("20250301_101500"))
+    state = StateManager(debates_dir=str(tmp_path))
+    new_id = state.start_new_debate("A new topic")
+    state.save_current_debate(new_id)
+    state.flush()
+
+    assert (shard_dir(tmp_path, new_id) / f"{new_id}.debate").read_bytes().startswith(MAGIC)
+    assert [d["debate_id"] for d in state.list_debates()] == [new_id, "20250301_101500"]
+    assert state.load_debate("20250301_101500")["opinions"]["1"]["member_name"] == "Member 1"
+    assert state.load_debate(new_id)["prompt"] == "A new topic"
+
+
+def test_migration_converts_history_once(tmp_path, capsys):
+    """The migration rewrites legacy files, keeps indexes in sync and is idempotent"""
+    for day in range(1, 4):
+        write_legacy(tmp_path, sample_debate(f"202503{day:02d}_101500"))
+    (tmp_path / "20250304_101500.json").write_text("{ truncated")
+
+    dry_run = migrate_format(tmp_path, "zlib", dry_run=True)
+    assert dry_run["converted"] == 3
+    assert not list(tmp_path.glob("*.debate"))
+
+    assert migrate_main(["--debates-dir", str(tmp_path), "--layout", "flat"]) == 1
+    assert "Converted 3 debate(s)" in capsys.readouterr().err
+    assert sorted(p.name for p in tmp_path.glob("2025*")) == [
+        "20250301_101500.debate", "20250302_101500.debate", "20250303_101500.debate", "20250304_101500.json"
+    ]
+
+    state = StateManager(debates_dir=str(tmp_path))
+    # Only the unreadable leftover is read again; migrated debates are already indexed
+    assert state.index.refresh() == 1
+    assert len(state.list_debates()) == 3
+    assert state.search_debates("four-day")[1] == 3
+
+    assert migrate_format(tmp_path)["converted"] == 0
+
+
+def test_state_reads_flat_and_sharded_debates_together(tmp_path):
+    """Flat files from before sharding are listed and loaded next to sharded ones"""
+    write_legacy(tmp_path, sample_debate("20250301_101500"))
+    sharded = shard_dir(tmp_path, "20250302_101500")
+    sharded.mkdir(parents=True)
+    (sharded / "20250302_101500.debate").write_bytes(encode_debate(sample_debate("20250302_101500")))
+
+    state = StateManager(debates_dir=str(tmp_path))
+
+    assert [d["debate_id"] for d in state.list_debates()] == ["20250302_101500", "20250301_101500"]
+    assert state.load_debate("20250301_101500")["debate_id"] == "20250301_101500"
+    assert state.load_debate("20250302_101500")["debate_id"] == "20250302_101500"
+    assert state.search_debates("four-day")[1] == 2
+
+
+def test_flat_layout_setting_keeps_saving_to_the_top_level(tmp_path, monkeypatch):
+    """COUNCIL_DEBATES_LAYOUT=flat writes new debates straight into debates/"""
+    monkeypatch.setenv("COUNCIL_DEBATES_LAYOUT", "flat")
+    state = StateManager(debates_dir=str(tmp_path))
+    debate_id = state.start_new_debate("A flat topic")
+    state.save_current_debate(debate_id)
+    state.flush()
+
+    assert (tmp_path / f"{debate_id}.debate").exists()
+    assert not shard_dir(tmp_path, debate_id).exists()
+
+
+def test_layout_migration_moves_debates_into_shards_and_back(tmp_path, capsys):
+    """Flat debates move into their day directories without re-reading them, and can be moved back"""
+    for day in range(1, 3):
+        write_legacy(tmp_path, sample_debate(f"202503{day:02d}_101500"))
+
+    state = StateManager(debates_dir=str(tmp_path))
+    assert len(state.list_debates()) == 2
+
+    assert migrate_layout(tmp_path, dry_run=True) == {"moved": 2, "conflicts": 0}
+    assert migrate_main(["--debates-dir", str(tmp_path)]) == 0
+    assert "Moved 2 debate file(s) to the sharded layout" in capsys.readouterr().err
+    assert not list(tmp_path.glob("2025*.*"))
+    assert (shard_dir(tmp_path, "20250302_101500") / "20250302_101500.debate").exists()
+
+    state = StateManager(debates_dir=str(tmp_path))
+    # Renames keep mtimes, so the index only learns the new directories
+    assert state.index.refresh() == 0
+    assert state.load_debate("20250301_101500")["debate_id"] == "20250301_101500"
+
+    assert migrate_layout(tmp_path, "flat") == {"moved": 2, "conflicts": 0}
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("2025")) == [
+        "20250301_101500.debate", "20250302_101500.debate"
+    ]
+
+
+def test_layout_migration_leaves_conflicting_copies_alone(tmp_path):
+    """A debate already present in its shard is not overwritten by the flat copy"""
+    write_legacy(tmp_path, sample_debate("20250301_101500"))
+    sharded = shard_dir(tmp_path, "20250301_101500")
+    sharded.mkdir(parents=True)
+    (sharded / "20250301_101500.json").write_text(json.dumps(sample_debate("20250301_101500")))
+
+    assert migrate_layout(tmp_path) == {"moved": 0, "conflicts": 1}
+    assert (tmp_path / "20250301_101500.json").exists()
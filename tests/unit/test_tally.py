@@ -0,0 +1,70 @@
+"""
+Sampled-ballot tally tests for Council of Mine MCP Server
+"""
+
+from collections import Counter
+
+from mcp_council_of_mine.council.tally import (
+    ballot_seed,
+    outcome_is_decided,
+    select_ballot_subset,
+    tally_sampled_ballots,
+    wilson_interval,
+)
+
+
+def test_subset_excludes_voter_and_is_reproducible():
+    """A voter never sees their own opinion and the same seed gives the same subset"""
+    opinion_ids = list(range(1, 41))
+    seed = ballot_seed("20251114_123456", 7)
+
+    subset = select_ballot_subset(7, opinion_ids, 5, seed, strategy="random")
+    assert len(subset) == 5
+    assert 7 not in subset
+    assert subset == select_ballot_subset(7, opinion_ids, 5, seed, strategy="random")
+
+
+def test_stratified_subsets_balance_exposure():
+    """Stratified sampling shows every opinion about equally often"""
+    opinion_ids = list(range(1, 31))
+    exposures = Counter()
+
+    for voter_id in opinion_ids:
+        subset = select_ballot_subset(
+            voter_id, opinion_ids, 6, ballot_seed("debate", voter_id), exposures
+        )
+        exposures.update(subset)
+
+    assert max(exposures.values()) - min(exposures.values()) <= 1
+
+
+def test_tally_normalizes_by_exposure():
+    """An opinion with fewer votes but a higher vote rate wins"""
+    ballots = {
+        1: ([2, 3], 2),
+        4: ([2, 3], 2),
+        5: ([3, 6], 3),
+        7: ([3, 6], 3),
+        8: ([3, 6], 3),
+        9: ([3, 6], 6),
+    }
+    tally = tally_sampled_ballots(ballots, seed="debate")
+
+    assert tally["exposures"] == {2: 2, 3: 6, 6: 4}
+    assert tally["normalized_scores"][2] == 1.0
+    assert tally["winners"] == [2], "Two votes from two showings beats three from six"
+    assert 0.0 <= tally["winner_confidence"] <= 1.0
+
+
+def test_wilson_interval_bounds():
+    """Intervals stay within [0, 1] and contain the observed rate"""
+    low, high = wilson_interval(3, 4)
+    assert 0.0 <= low < 0.75 < high <= 1.0
+    assert wilson_interval(0, 0) == (0.0, 0.0)
+
+
+def test_outcome_is_decided_only_when_lead_is_safe():
+    """A lead is decisive only if every remaining ballot going to the runner-up cannot tie it"""
+    assert outcome_is_decided(Counter({1: 5, 2: 1}), remaining_ballots=3)
+    assert not outcome_is_decided(Counter({1: 5, 2: 1}), remaining_ballots=4), "A tie changes the winners"
+    assert not outcome_is_decided(Counter(), remaining_ballots=0)
@@ -0,0 +1,55 @@
+"""
+Tracing tests for Council of Mine MCP Server
+"""
+
+import json
+
+import pytest
+
+from mcp_council_of_mine.tracing import Tracer
+
+
+def read_spans(path) -> list[dict]:
+    return [
+        json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        for line in path.read_text().splitlines()
+    ]
+
+
+def test_spans_nest_and_inherit_debate_id(tmp_path):
+    """Children share the trace, point at their parent and inherit debate_id"""
+    tracer = Tracer(str(tmp_path / "trace.jsonl"))
+
+    with tracer.span("tool/get_results", debate_id="20251114_123456"):
+        with tracer.span("sample", member_id=3):
+            pass
+
+    child, root = read_spans(tmp_path / "trace.jsonl")
+    assert child["traceId"] == root["traceId"]
+    assert child["parentSpanId"] == root["spanId"]
+    assert "parentSpanId" not in root
+    attributes = {a["key"]: a["value"] for a in child["attributes"]}
+    assert attributes == {
+        "debate_id": {"stringValue": "20251114_123456"},
+        "member_id": {"intValue": "3"},
+    }
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+
+def test_failed_span_records_error_status(tmp_path):
+    """Exceptions mark the span as an error and still propagate"""
+    tracer = Tracer(str(tmp_path / "trace.jsonl"))
+
+    with pytest.raises(ValueError):
+        with tracer.span("state/save"):
+            raise ValueError("disk full")
+
+    (span,) = read_spans(tmp_path / "trace.jsonl")
+    assert span["status"] == {"code": 2, "message": "ValueError: disk full"}
+
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    """Without a trace file spans are no-ops"""
+    with Tracer(None).span("sample") as span:
+        assert span is None
+    assert list(tmp_path.iterdir()) == []
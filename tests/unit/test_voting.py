@@ -0,0 +1,152 @@
+"""
+Voting tests for Council of Mine MCP Server
+"""
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+from mcp_council_of_mine.council.members import get_all_members
+from mcp_council_of_mine.council.state import StateManager
+from mcp_council_of_mine.progress import ProgressReporter
+from mcp_council_of_mine.sampling import measure_prefix_overlap
+from mcp_council_of_mine.tools.voting import (
+    build_voting_prompt,
+    collect_votes,
+    parse_ballot,
+    parse_batched_ballots,
+)
+
+
+class OutOfOrderContext:
+    """Context whose ballots complete in reverse member order"""
+
+    async def sample(self, messages, **kwargs):
+        member_id = next(
+            m["id"] for m in get_all_members() if f"You are {m['name']}" in messages
+        )
+        await asyncio.sleep(0.001 * (10 - member_id))
+        vote_for = 1 if member_id != 1 else 2
+        return SimpleNamespace(content=[SimpleNamespace(text=f"VOTE: {vote_for}\nREASONING: r{member_id}")])
+
+    def __init__(self):
+        self.progress = []
+        self.partials = []
+
+    async def info(self, *args, **kwargs):
+        pass
+
+    async def warning(self, *args, **kwargs):
+        pass
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append((progress, total, message))
+
+    async def log(self, message, level=None, logger_name=None, extra=None):
+        self.partials.append(extra)
+
+
+def test_parse_ballot_structured():
+    """Structured VOTE/REASONING responses are parsed"""
+    vote_id, reasoning = parse_ballot("VOTE: 3\nREASONING: It is practical.")
+    assert vote_id == 3
+    assert reasoning == "It is practical."
+
+
+def test_parse_ballot_unstructured_fallback():
+    """Free-form responses fall back to the first member number"""
+    vote_id, reasoning = parse_ballot("I prefer opinion 7 because it is inclusive")
+    assert vote_id == 7
+    assert "inclusive" in reasoning
+
+
+def test_collect_votes_is_deterministic(tmp_path):
+    """Votes are recorded in member order regardless of completion order"""
+    state = StateManager(debates_dir=str(tmp_path))
+    state.start_new_debate("Test topic")
+    for member in get_all_members():
+        state.add_opinion(member["id"], member["name"], f"Opinion from {member['name']}")
+
+    current = state.get_current_debate()
+    asyncio.run(collect_votes(OutOfOrderContext(), state, current))
+
+    assert list(current["votes"].keys()) == [m["id"] for m in get_all_members()]
+    assert current["votes"][1]["voted_for_id"] == 2
+    assert all(
+        re.fullmatch(r"r\d", vote["reasoning"]) for vote in current["votes"].values()
+    )
+
+
+def test_collect_votes_reports_progress(tmp_path):
+    """Each ballot advances progress and is pushed as a partial result"""
+    state = StateManager(debates_dir=str(tmp_path))
+    debate_id = state.start_new_debate("Test topic")
+    for member in get_all_members():
+        state.add_opinion(member["id"], member["name"], f"Opinion from {member['name']}")
+
+    ctx = OutOfOrderContext()
+    progress = ProgressReporter(ctx, 9, debate_id)
+    asyncio.run(collect_votes(ctx, state, state.get_current_debate(), use_cache=False, progress=progress))
+
+    values = [value for value, _, _ in ctx.progress]
+    assert values == list(range(10)), "Progress should start at 0 and count every ballot"
+    assert ctx.progress[-1][2] == "voting: 9/9"
+
+    assert [partial["member_id"] for partial in ctx.partials] == list(range(9, 0, -1)), \
+        "Partials should arrive in completion order"
+    assert all(partial["type"] == "ballot" and partial["valid"] for partial in ctx.partials)
+    assert ctx.partials[0]["debate_id"] == debate_id
+
+
+def test_decisive_voting_stops_once_outcome_is_settled(tmp_path):
+    """Ballots still outstanding once the winner is certain are skipped and recorded"""
+    state = StateManager(debates_dir=str(tmp_path))
+    state.start_new_debate("Test topic")
+    for member in get_all_members():
+        state.add_opinion(member["id"], member["name"], f"Opinion from {member['name']}")
+
+    current = state.get_current_debate()
+    asyncio.run(collect_votes(OutOfOrderContext(), state, current, use_cache=False, decisive=True))
+
+    # Members 9..5 answer first and all pick Opinion 1; four ballots cannot overturn 5 votes
+    voted = list(current["votes"].keys())
+    assert 5 <= len(voted) < 9
+    assert voted == list(range(10 - len(voted), 10))
+    assert current["abstentions"] == [
+        {"member_id": m["id"], "member_name": m["name"], "reason": "outcome already decided"}
+        for m in get_all_members()[:9 - len(voted)]
+    ]
+
+
+def test_parse_batched_ballots_enforces_rules():
+    """Self-votes, unknown opinions and non-voters are rejected"""
+    members = get_all_members()
+    opinions = {m["id"]: {"member_id": m["id"]} for m in members}
+    response = (
+        "MEMBER 1:\nVOTE: 4\nREASONING: Practical upside.\n\n"
+        "MEMBER 2:\nVOTE: 2\nREASONING: My own idea.\n\n"
+        "MEMBER 3:\nVOTE: 12\nREASONING: Not an opinion.\n\n"
+        "MEMBER 42:\nVOTE: 1\nREASONING: Not a voter.\n"
+    )
+
+    ballots = parse_batched_ballots(response, members, opinions)
+    assert ballots == {1: (4, "Practical upside.")}
+
+
+def test_ballot_prompts_share_opinion_prefix(monkeypatch):
+    """Every ballot starts with the same opinion block; per-voter text comes last"""
+    members = get_all_members()
+    opinions = [
+        {"member_id": m["id"], "member_name": m["name"], "opinion": "x" * 500}
+        for m in members
+    ]
+
+    prompts = [build_voting_prompt(m, "Topic", opinions)["prompt"] for m in members]
+    overlap = measure_prefix_overlap(prompts)
+    assert overlap["overlap_ratio"] > 0.5, f"Expected a large shared prefix, got {overlap}"
+    assert "Your own opinion is Opinion 3" in prompts[2]
+
+    monkeypatch.setenv("COUNCIL_VOTING_PROMPT_LAYOUT", "system")
+    ballot = build_voting_prompt(members[0], "Topic", opinions)
+    assert "=== END OPINIONS ===" in ballot["system_prompt"]
+    assert "=== END OPINIONS ===" not in ballot["prompt"]